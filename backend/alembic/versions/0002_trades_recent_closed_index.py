@@ -0,0 +1,30 @@
+"""Add covering index for recent closed trades
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covering index for the dashboard "recent closed trades" query
+    op.create_index(
+        'ix_trades_user_closetime_desc',
+        'trades',
+        ['user_id', sa.text('close_time DESC')],
+        unique=False,
+        postgresql_include=['symbol', 'trade_type', 'net_profit', 'status'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trades_user_closetime_desc', table_name='trades')
@@ -0,0 +1,36 @@
+"""Add mv_pair_stats materialized view
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-symbol aggregates over closed trades, refreshed hourly by the analytics service
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_pair_stats AS
+        SELECT symbol,
+               COUNT(*) AS trade_count,
+               SUM(net_profit) AS total_profit,
+               AVG(CASE WHEN net_profit > 0 THEN 1.0 ELSE 0 END) AS win_rate
+        FROM trades
+        WHERE status = 'CLOSED'
+        GROUP BY symbol
+        WITH DATA
+    """)
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_mv_pair_stats_symbol', 'mv_pair_stats', ['symbol'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mv_pair_stats_symbol', table_name='mv_pair_stats')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_pair_stats')
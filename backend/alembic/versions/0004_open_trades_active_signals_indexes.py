@@ -0,0 +1,39 @@
+"""Add partial indexes for open trades and active signals
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Trading bot's per-cycle "open trades for this account" query
+    op.create_index(
+        'ix_trades_account_open',
+        'trades',
+        ['mt5_account_id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'OPEN'"),
+    )
+    # Trading bot's "active signals created since the last check" query
+    op.create_index(
+        'ix_trading_signals_active_created',
+        'trading_signals',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trading_signals_active_created', table_name='trading_signals')
+    op.drop_index('ix_trades_account_open', table_name='trades')
@@ -0,0 +1,51 @@
+"""
+Shared FastAPI dependencies for API endpoints
+"""
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+
+def parse_body(adapter: TypeAdapter):
+    """Validate the raw request body straight into a model with adapter.validate_json.
+
+    Skips the intermediate dict FastAPI builds for `body: Model` parameters.
+    Validation errors are re-raised as RequestValidationError so clients still get a 422.
+    """
+    async def _dependency(request: Request):
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+            )
+
+    return _dependency
+
+
+def _inline_refs(node, defs: dict):
+    """Replace local #/$defs/ references with the definitions they point to."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if ref is not None and ref.startswith("#/$defs/"):
+            return _inline_refs(defs[ref[len("#/$defs/"):]], defs)
+        return {key: _inline_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(item, defs) for item in node]
+    return node
+
+
+def body_openapi(adapter: TypeAdapter) -> dict:
+    """openapi_extra documenting the JSON body a parse_body route reads.
+
+    FastAPI can't see a body read inside a dependency, so routes pass this to their decorator.
+    Nested definitions are inlined because $defs references don't resolve inside the OpenAPI document.
+    """
+    schema = adapter.json_schema()
+    defs = schema.pop("$defs", {})
+    return {
+        "requestBody": {
+            "content": {"application/json": {"schema": _inline_refs(schema, defs)}},
+            "required": True,
+        }
+    }
@@ -15,8 +15,9 @@ from app.models.trading_signal import TradingSignal
 from app.models.payment import Payment, Subscription
 from app.schemas.admin import (
     UserManagement, SystemStats, UserActivity,
-    AdminDashboard, SignalManagement, PaymentOverview
+    AdminDashboard, SignalManagement, PaymentOverview, PairStats
 )
+from app.services.analytics_service import analytics_service
 
 router = APIRouter()
 
@@ -293,6 +294,22 @@ async def get_all_payments(
             detail=f"Error fetching payments: {str(e)}"
         )
 
+@router.get("/pair-stats", response_model=List[PairStats])
+async def get_pair_stats(
+    limit: int = 10,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Get most traded pairs from the hourly-refreshed mv_pair_stats view"""
+    try:
+        return await analytics_service.get_top_pairs(db, limit)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching pair stats: {str(e)}"
+        )
+
 @router.get("/system-stats", response_model=SystemStats)
 async def get_system_stats(
     current_user: User = Depends(require_admin),
@@ -4,6 +4,7 @@ from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.api.deps import body_openapi, parse_body
 from app.core.database import get_db
 from app.core.security import (
     authenticate_user,
@@ -24,15 +25,22 @@ from app.schemas.user import (
     TokenRefresh,
     PasswordChange,
     PasswordReset,
-    PasswordResetConfirm
+    PasswordResetConfirm,
+    UserCreateAdapter,
+    UserLoginAdapter,
+    PasswordChangeAdapter,
+    PasswordResetConfirmAdapter
 )
 
 router = APIRouter()
 
+# Profile fields a user may change through PUT /me
+_UPDATABLE_USER_FIELDS = frozenset({"full_name", "phone", "country", "timezone", "avatar_url"})
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED, openapi_extra=body_openapi(UserCreateAdapter))
 async def register_user(
-    user_data: UserCreate,
+    user_data: UserCreate = Depends(parse_body(UserCreateAdapter)),
     db: AsyncSession = Depends(get_db)
 ):
     """Register a new user."""
@@ -67,9 +75,9 @@ async def register_user(
     return db_user
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, openapi_extra=body_openapi(UserLoginAdapter))
 async def login_user(
-    user_credentials: UserLogin,
+    user_credentials: UserLogin = Depends(parse_body(UserLoginAdapter)),
     db: AsyncSession = Depends(get_db)
 ):
     """Authenticate user and return tokens."""
@@ -164,9 +172,8 @@ async def update_current_user(
 ):
     """Update current user information."""
     # Update allowed fields
-    allowed_fields = ["full_name", "phone", "country", "timezone", "avatar_url"]
     for field, value in user_update.items():
-        if field in allowed_fields and hasattr(current_user, field):
+        if field in _UPDATABLE_USER_FIELDS and hasattr(current_user, field):
             setattr(current_user, field, value)
     
     await db.commit()
@@ -174,9 +181,9 @@ async def update_current_user(
     return current_user
 
 
-@router.post("/change-password")
+@router.post("/change-password", openapi_extra=body_openapi(PasswordChangeAdapter))
 async def change_password(
-    password_data: PasswordChange,
+    password_data: PasswordChange = Depends(parse_body(PasswordChangeAdapter)),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -222,9 +229,9 @@ async def forgot_password(
     return {"message": "If the email exists, a reset link has been sent"}
 
 
-@router.post("/reset-password")
+@router.post("/reset-password", openapi_extra=body_openapi(PasswordResetConfirmAdapter))
 async def reset_password(
-    reset_data: PasswordResetConfirm,
+    reset_data: PasswordResetConfirm = Depends(parse_body(PasswordResetConfirmAdapter)),
     db: AsyncSession = Depends(get_db)
 ):
     """Reset password with token."""
@@ -3,52 +3,71 @@ Dashboard endpoints for real-time data and analytics
 """
 from typing import List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
-from app.models.trade import Trade
-from app.models.trading_signal import TradingSignal
+from app.models.mt5_account import MT5Account
+from app.models.trade import Trade, TradeStatus
+from app.models.trading_signal import TradingSignal, SignalStatus
 from app.schemas.dashboard import (
     DashboardOverview, PerformanceMetrics, RecentActivity,
     MarketData, SignalAnalytics
 )
-from app.services.mt5_service import MT5Service
-from app.services.ai_service import AIService
+from app.services.mt5_service import mt5_service
 
 router = APIRouter()
 
 @router.get("/overview", response_model=DashboardOverview)
 async def get_dashboard_overview(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get dashboard overview with key metrics"""
     try:
-        # Get account balance from MT5
-        mt5_service = MT5Service()
-        account_info = await mt5_service.get_account_info(current_user.id)
+        # Get account balance from the user's MT5 account, if one is connected
+        result = await db.execute(
+            select(MT5Account).where(
+                MT5Account.user_id == current_user.id,
+                MT5Account.is_active == True
+            ).limit(1)
+        )
+        account = result.scalar_one_or_none()
+        account_info = (await mt5_service.get_account_info(account) if account else None) or {}
         
-        # Get recent trades
-        recent_trades = db.query(Trade).filter(
-            Trade.user_id == current_user.id
-        ).order_by(Trade.created_at.desc()).limit(5).all()
+        # Get recent closed trades (served by ix_trades_user_closetime_desc)
+        result = await db.execute(
+            select(Trade.symbol, Trade.trade_type, Trade.net_profit, Trade.status)
+            .where(
+                Trade.user_id == current_user.id,
+                Trade.status == TradeStatus.CLOSED
+            )
+            .order_by(Trade.close_time.desc())
+            .limit(10)
+        )
+        recent_trades = result.all()
         
         # Get active signals
-        active_signals = db.query(TradingSignal).filter(
-            TradingSignal.status == "active"
-        ).limit(5).all()
+        result = await db.execute(
+            select(TradingSignal.id)
+            .where(TradingSignal.status == SignalStatus.ACTIVE)
+            .limit(5)
+        )
+        active_signals = result.all()
         
         # Calculate performance metrics
         today = datetime.utcnow().date()
-        today_trades = db.query(Trade).filter(
-            Trade.user_id == current_user.id,
-            Trade.created_at >= today
-        ).all()
-        
-        today_profit = sum([t.profit for t in today_trades if t.profit]) or 0
+        result = await db.execute(
+            select(func.coalesce(func.sum(Trade.profit), 0)).where(
+                Trade.user_id == current_user.id,
+                Trade.created_at >= today
+            )
+        )
+        today_profit = result.scalar_one()
         
         return DashboardOverview(
             account_balance=account_info.get("balance", 0),
@@ -61,8 +80,8 @@ async def get_dashboard_overview(
             recent_trades=[{
                 "symbol": trade.symbol,
                 "type": trade.trade_type,
-                "profit": trade.profit,
-                "created_at": trade.created_at
+                "profit": trade.net_profit,
+                "status": trade.status
             } for trade in recent_trades]
         )
         
@@ -192,7 +211,6 @@ async def get_market_data(
 ):
     """Get real-time market data for specified symbols"""
     try:
-        mt5_service = MT5Service()
         market_data = []
         
         for symbol in symbols:
@@ -288,7 +306,6 @@ async def get_chart_data(
 ):
     """Get chart data for a specific symbol"""
     try:
-        mt5_service = MT5Service()
         chart_data = await mt5_service.get_chart_data(symbol, timeframe, bars)
         
         return {
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 
 from app.core.database import get_db
@@ -395,6 +395,8 @@ async def get_open_positions(
 async def get_trade_history(
     account_id: int,
     days: int = 30,
+    symbol: Optional[str] = None,
+    limit: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -414,7 +416,7 @@ async def get_trade_history(
                 detail="MT5 account not found"
             )
         
-        history = await mt5_service.get_trade_history(account, days)
+        history = await mt5_service.get_trade_history(account, days, symbol=symbol, limit=limit)
         
         return [MT5TradeHistoryResponse(**trade) for trade in history]
         
@@ -1,19 +1,22 @@
 """
 Subscription and payment endpoints
 """
+from decimal import Decimal
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 import stripe
 import os
 
+from app.api.deps import body_openapi, parse_body
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.payment import Payment, Subscription
 from app.schemas.subscription import (
     SubscriptionPlan, SubscriptionResponse, PaymentCreate,
-    PaymentResponse, BillingHistory, SubscriptionUpdate
+    PaymentResponse, BillingHistory, SubscriptionUpdate, BillingHistoryListAdapter,
+    PaymentCreateAdapter, SubscriptionUpdateAdapter
 )
 
 router = APIRouter()
@@ -24,19 +27,19 @@ stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 SUBSCRIPTION_PLANS = {
     "basic": {
         "name": "Basic Plan",
-        "price": 29.99,
+        "price": Decimal("29.99"),
         "features": ["Basic signals", "Email support", "5 MT5 accounts"],
         "stripe_price_id": os.getenv("STRIPE_BASIC_PRICE_ID")
     },
     "professional": {
         "name": "Professional Plan", 
-        "price": 79.99,
+        "price": Decimal("79.99"),
         "features": ["Advanced signals", "Priority support", "Unlimited MT5 accounts", "Risk management tools"],
         "stripe_price_id": os.getenv("STRIPE_PRO_PRICE_ID")
     },
     "enterprise": {
         "name": "Enterprise Plan",
-        "price": 199.99,
+        "price": Decimal("199.99"),
         "features": ["Premium signals", "24/7 support", "Custom strategies", "API access", "White-label solution"],
         "stripe_price_id": os.getenv("STRIPE_ENTERPRISE_PRICE_ID")
     }
@@ -70,11 +73,11 @@ async def get_current_subscription(
     if not subscription:
         return None
     
-    return SubscriptionResponse.from_orm(subscription)
+    return SubscriptionResponse.from_orm_trusted(subscription)
 
-@router.post("/create-payment-intent")
+@router.post("/create-payment-intent", openapi_extra=body_openapi(PaymentCreateAdapter))
 async def create_payment_intent(
-    payment_data: PaymentCreate,
+    payment_data: PaymentCreate = Depends(parse_body(PaymentCreateAdapter)),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -90,7 +93,7 @@ async def create_payment_intent(
         # Calculate amount (convert to cents for Stripe)
         amount = int(plan["price"] * 100)
         if payment_data.billing_cycle == "annual":
-            amount = int(amount * 12 * 0.8)  # 20% discount for annual
+            amount = int(amount * 12 * Decimal("0.8"))  # 20% discount for annual
         
         # Create payment intent
         intent = stripe.PaymentIntent.create(
@@ -199,9 +202,9 @@ async def confirm_payment(
             detail=f"Payment confirmation error: {str(e)}"
         )
 
-@router.put("/update")
+@router.put("/update", openapi_extra=body_openapi(SubscriptionUpdateAdapter))
 async def update_subscription(
-    subscription_update: SubscriptionUpdate,
+    subscription_update: SubscriptionUpdate = Depends(parse_body(SubscriptionUpdateAdapter)),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -274,7 +277,11 @@ async def get_billing_history(
         Payment.user_id == current_user.id
     ).order_by(Payment.created_at.desc()).all()
     
-    return [BillingHistory.from_orm(payment) for payment in payments]
+    rows = BillingHistoryListAdapter.validate_python(payments, from_attributes=True)
+    return Response(
+        content=BillingHistoryListAdapter.dump_json(rows, exclude_none=True),
+        media_type="application/json"
+    )
 
 @router.post("/webhook")
 async def stripe_webhook(request: dict):
@@ -1,26 +1,31 @@
 """
 Trading endpoints for executing trades and managing positions
 """
+import asyncio
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import body_openapi, parse_body
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.mt5_account import MT5Account
 from app.models.trade import Trade
 from app.schemas.trading import (
     TradeCreate, TradeResponse, TradeUpdate, TradeHistory,
-    PositionResponse, RiskManagementSettings
+    PositionResponse, RiskManagementSettings, TradeHistoryListAdapter,
+    PositionListAdapter, TradeCreateAdapter
 )
 from app.services.trading_bot import TradingBot
-from app.services.mt5_service import MT5Service
+from app.services.mt5_service import mt5_service
 
 router = APIRouter()
 
-@router.post("/execute", response_model=TradeResponse)
+@router.post("/execute", response_model=TradeResponse, openapi_extra=body_openapi(TradeCreateAdapter))
 async def execute_trade(
-    trade_data: TradeCreate,
+    trade_data: TradeCreate = Depends(parse_body(TradeCreateAdapter)),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -61,7 +66,8 @@ async def execute_trade(
         await db.commit()
         await db.refresh(trade)
         
-        return TradeResponse.from_orm(trade)
+        # mt5_ticket is stored as a string column, so this response needs validation to coerce it
+        return TradeResponse.model_validate(trade)
         
     except Exception as e:
         raise HTTPException(
@@ -76,9 +82,19 @@ async def get_open_positions(
 ):
     """Get all open positions"""
     try:
-        mt5_service = MT5Service()
-        positions = await mt5_service.get_positions(current_user.id)
-        return positions
+        # Positions across all of the user's active MT5 accounts
+        result = await db.execute(
+            select(MT5Account).where(
+                MT5Account.user_id == current_user.id,
+                MT5Account.is_active == True
+            )
+        )
+        accounts = result.scalars().all()
+        per_account = await asyncio.gather(*(mt5_service.get_open_positions(account) for account in accounts))
+        positions = [position for account_positions in per_account for position in account_positions]
+        # Serialize the whole list in one pydantic-core call and skip FastAPI's response_model pass
+        rows = PositionListAdapter.validate_python(positions)
+        return Response(content=PositionListAdapter.dump_json(rows), media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -144,7 +160,11 @@ async def get_trade_history(
     query = query.order_by(Trade.created_at.desc()).offset(offset).limit(limit)
     result = await db.execute(query)
     trades = result.scalars().all()
-    return [TradeHistory.from_orm(trade) for trade in trades]
+    rows = TradeHistoryListAdapter.validate_python(trades, from_attributes=True)
+    return Response(
+        content=TradeHistoryListAdapter.dump_json(rows, exclude_none=True),
+        media_type="application/json"
+    )
 
 @router.get("/statistics")
 async def get_trading_statistics(
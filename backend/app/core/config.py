@@ -37,13 +37,19 @@ class Settings(BaseSettings):
     
     # MT5 Settings
     MT5_SERVER_TIMEOUT: int = 60000
+    MT5_ENCRYPTION_KEY: Optional[str] = None  # Fernet key for stored MT5 passwords
     MT5_MAX_RETRIES: int = 3
+    MT5_SESSION_IDLE_TIMEOUT: int = 300  # seconds a login is reused before being re-checked or evicted
+    MT5_KEEPALIVE_INTERVAL: int = 30  # seconds between pings of the current login
     
     # AI/ML Settings
     MODEL_UPDATE_INTERVAL: int = 3600  # seconds
     SIGNAL_CONFIDENCE_THRESHOLD: float = 0.7
     MAX_CONCURRENT_TRADES: int = 10
     
+    # Analytics
+    ANALYTICS_REFRESH_INTERVAL: int = 3600  # seconds
+    
     # File Upload
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     UPLOAD_DIR: str = "uploads"
@@ -1,14 +1,19 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 import uvicorn
+import asyncio
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import engine, Base
 from app.api.v1.api import api_router
 from app.core.security import get_current_user
+from app.schemas import init_schemas
+from app.services.analytics_service import analytics_service
+from app.services.mt5_service import mt5_service
 
 
 @asynccontextmanager
@@ -16,8 +21,15 @@ async def lifespan(app: FastAPI):
     # Startup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    init_schemas()
+    analytics_task = asyncio.create_task(analytics_service.start_refresh_loop())
+    mt5_task = asyncio.create_task(mt5_service.start_session_monitor())
     yield
     # Shutdown
+    analytics_service.stop_refresh_loop()
+    analytics_task.cancel()
+    mt5_service.stop_session_monitor()
+    mt5_task.cancel()
     await engine.dispose()
 
 
@@ -26,6 +38,7 @@ app = FastAPI(
     description="Advanced AI-powered trading platform with MT5 integration",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
 )
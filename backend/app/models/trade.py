@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -77,5 +77,21 @@ class Trade(Base):
     mt5_account = relationship("MT5Account", back_populates="trades")
     signal = relationship("TradingSignal", back_populates="trades")
 
+    __table_args__ = (
+        # Covering index for the dashboard's "recent closed trades" query
+        Index(
+            "ix_trades_user_closetime_desc",
+            user_id,
+            close_time.desc(),
+            postgresql_include=["symbol", "trade_type", "net_profit", "status"],
+        ),
+        # Partial index for the trading bot's open trades per account query
+        Index(
+            "ix_trades_account_open",
+            mt5_account_id,
+            postgresql_where=(status == TradeStatus.OPEN),
+        ),
+    )
+
     def __repr__(self):
         return f"<Trade(id={self.id}, symbol='{self.symbol}', type='{self.trade_type}', status='{self.status}')>"
\ No newline at end of file
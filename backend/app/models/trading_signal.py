@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -66,5 +66,14 @@ class TradingSignal(Base):
     # Relationships
     trades = relationship("Trade", back_populates="signal")
 
+    __table_args__ = (
+        # Partial index for the trading bot's new active signals query
+        Index(
+            "ix_trading_signals_active_created",
+            created_at,
+            postgresql_where=(status == SignalStatus.ACTIVE),
+        ),
+    )
+
     def __repr__(self):
         return f"<TradingSignal(id={self.id}, symbol='{self.symbol}', type='{self.signal_type}', confidence={self.confidence_score})>"
\ No newline at end of file
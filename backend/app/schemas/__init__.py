@@ -0,0 +1,21 @@
+from .subscription import BillingHistory, PaymentResponse, SubscriptionResponse
+from .trading import TradeHistory, TradeResponse
+from .user import UserResponse, UserStats
+
+
+def init_schemas():
+    """Build the deferred schemas served by hot endpoints so the first request doesn't pay for it."""
+    for model in (TradeHistory, BillingHistory, UserResponse):
+        model.model_rebuild()
+
+
+__all__ = [
+    "BillingHistory",
+    "PaymentResponse",
+    "SubscriptionResponse",
+    "TradeHistory",
+    "TradeResponse",
+    "UserResponse",
+    "UserStats",
+    "init_schemas"
+]
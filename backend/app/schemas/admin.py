@@ -122,6 +122,12 @@ class TradingAnalytics(BaseModel):
     trading_by_hour: List[dict]
     win_rate_by_pair: List[dict]
     
+class PairStats(BaseModel):
+    symbol: str
+    trade_count: int
+    total_profit: float
+    win_rate: float
+    
 class UserEngagement(BaseModel):
     daily_active_users: int
     weekly_active_users: int
@@ -0,0 +1,41 @@
+"""
+Shared base classes for Pydantic schemas
+"""
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import AwareDatetime, BaseModel, BeforeValidator, Field, PlainSerializer, Strict
+
+# Timestamps read from timezone-aware DB columns are already datetime objects,
+# so skip the str/int parsing paths of the lax datetime validator
+DbDatetime = Annotated[AwareDatetime, Strict()]
+
+
+def _round_money(value):
+    """Round float amounts (Float columns, pricing arithmetic) to Money's 4 decimal places."""
+    if isinstance(value, float):
+        return Decimal(str(round(value, 4)))
+    return value
+
+
+# Monetary amounts are held as Decimal for exact arithmetic, but still go out as JSON numbers
+Money = Annotated[
+    Decimal,
+    BeforeValidator(_round_money),
+    Field(ge=0, max_digits=14, decimal_places=4),
+    PlainSerializer(float, return_type=float, when_used='json'),
+]
+
+
+class TrustedOrm(BaseModel):
+    """Mixin for response schemas that are built from our own database rows."""
+    
+    @classmethod
+    def from_orm_trusted(cls, obj):
+        """Build the schema from a SQLAlchemy row without running validation.
+        
+        Only use this for rows loaded from the database, never for API input, and only
+        for schemas whose field types exactly match the column types: nothing is coerced
+        or checked. A field the row doesn't have raises AttributeError.
+        """
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
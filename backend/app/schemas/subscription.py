@@ -1,22 +1,26 @@
 """
 Pydantic schemas for subscription and payment endpoints
 """
-from pydantic import BaseModel, validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, StringConstraints, TypeAdapter
+from typing import Annotated, Optional, List, Literal
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
+from app.schemas.base import DbDatetime, Money, TrustedOrm
 
-class BillingCycle(str, Enum):
+PlanId = Literal["basic", "professional", "enterprise"]
+
+class BillingCycle(StrEnum):
     MONTHLY = "monthly"
     ANNUAL = "annual"
 
-class SubscriptionStatus(str, Enum):
+class SubscriptionStatus(StrEnum):
     ACTIVE = "active"
+    INACTIVE = "inactive"
     CANCELLED = "cancelled"
     EXPIRED = "expired"
     PENDING = "pending"
 
-class PaymentStatus(str, Enum):
+class PaymentStatus(StrEnum):
     PENDING = "pending"
     COMPLETED = "completed"
     FAILED = "failed"
@@ -25,76 +29,59 @@ class PaymentStatus(str, Enum):
 class SubscriptionPlan(BaseModel):
     id: str
     name: str
-    price: float
+    price: Money
     features: List[str]
     stripe_price_id: Optional[str] = None
-    
-    @validator('price')
-    def validate_price(cls, v):
-        if v < 0:
-            raise ValueError('Price cannot be negative')
-        return v
 
 class PaymentCreate(BaseModel):
-    plan_id: str
+    plan_id: PlanId
     billing_cycle: BillingCycle = BillingCycle.MONTHLY
-    
-    @validator('plan_id')
-    def validate_plan_id(cls, v):
-        valid_plans = ["basic", "professional", "enterprise"]
-        if v not in valid_plans:
-            raise ValueError(f'Plan ID must be one of: {valid_plans}')
-        return v
-
-class PaymentResponse(BaseModel):
+
+class PaymentResponse(TrustedOrm):
     id: int
-    amount: float
+    amount: Money
     currency: str
     status: PaymentStatus
     stripe_payment_intent_id: Optional[str]
-    created_at: datetime
+    created_at: DbDatetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra='ignore', defer_build=True)
 
 class SubscriptionCreate(BaseModel):
-    plan_id: str
+    plan_id: PlanId
     billing_cycle: BillingCycle = BillingCycle.MONTHLY
 
 class SubscriptionUpdate(BaseModel):
-    plan_id: str
-    
-    @validator('plan_id')
-    def validate_plan_id(cls, v):
-        valid_plans = ["basic", "professional", "enterprise"]
-        if v not in valid_plans:
-            raise ValueError(f'Plan ID must be one of: {valid_plans}')
-        return v
-
-class SubscriptionResponse(BaseModel):
+    plan_id: PlanId
+
+class SubscriptionResponse(TrustedOrm):
     id: int
     plan_id: str
     billing_cycle: BillingCycle
     status: SubscriptionStatus
-    current_period_start: Optional[datetime]
-    current_period_end: Optional[datetime]
-    created_at: datetime
+    current_period_start: Optional[DbDatetime]
+    current_period_end: Optional[DbDatetime]
+    created_at: DbDatetime
     stripe_subscription_id: Optional[str]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra='ignore', defer_build=True)
 
-class BillingHistory(BaseModel):
+class BillingHistory(TrustedOrm):
     id: int
-    amount: float
+    amount: Money
     currency: str
     status: PaymentStatus
     description: Optional[str]
     invoice_url: Optional[str]
-    created_at: datetime
+    created_at: DbDatetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True, extra='ignore', defer_build=True,
+        frozen=True, revalidate_instances='never'
+    )
+
+# Batch validator for the billing history list endpoint
+BillingHistoryListAdapter = TypeAdapter(List[BillingHistory])
 
 class UsageStats(BaseModel):
     signals_used: int
@@ -103,6 +90,8 @@ class UsageStats(BaseModel):
     mt5_accounts_limit: int
     api_calls_used: int
     api_calls_limit: int
+    
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 class SubscriptionFeatures(BaseModel):
     max_signals_per_day: int
@@ -112,22 +101,28 @@ class SubscriptionFeatures(BaseModel):
     custom_strategies: bool
     api_access: bool
     white_label: bool
+    
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 class PlanComparison(BaseModel):
     plan_id: str
     name: str
-    price_monthly: float
-    price_annual: float
+    price_monthly: Money
+    price_annual: Money
     features: SubscriptionFeatures
     popular: bool = False
     
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
 class SubscriptionDetails(BaseModel):
     subscription: SubscriptionResponse
     plan: SubscriptionPlan
     usage: UsageStats
     next_billing_date: Optional[datetime]
-    amount_due: Optional[float]
+    amount_due: Optional[Money]
     
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
 class PaymentMethod(BaseModel):
     id: str
     type: str  # card, bank_account, etc.
@@ -139,8 +134,8 @@ class PaymentMethod(BaseModel):
 
 class Invoice(BaseModel):
     id: str
-    amount_paid: float
-    amount_due: float
+    amount_paid: Money
+    amount_due: Money
     currency: str
     status: str
     invoice_pdf: Optional[str]
@@ -151,9 +146,9 @@ class Invoice(BaseModel):
 class SubscriptionPreview(BaseModel):
     plan_id: str
     billing_cycle: BillingCycle
-    amount: float
-    tax_amount: Optional[float] = 0
-    total_amount: float
+    amount: Money
+    tax_amount: Optional[Money] = 0
+    total_amount: Money
     proration_amount: Optional[float] = 0
     next_billing_date: datetime
     
@@ -164,10 +159,10 @@ class CouponCode(BaseModel):
     valid_until: Optional[datetime]
     
 class ApplyCoupon(BaseModel):
-    coupon_code: str
-    
-    @validator('coupon_code')
-    def validate_coupon_code(cls, v):
-        if len(v.strip()) == 0:
-            raise ValueError('Coupon code cannot be empty')
-        return v.strip().upper()
\ No newline at end of file
+    coupon_code: Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True, min_length=1)]
+
+# Request body validators, used with app.api.deps.parse_body
+PaymentCreateAdapter = TypeAdapter(PaymentCreate)
+SubscriptionCreateAdapter = TypeAdapter(SubscriptionCreate)
+SubscriptionUpdateAdapter = TypeAdapter(SubscriptionUpdate)
+ApplyCouponAdapter = TypeAdapter(ApplyCoupon)
@@ -1,11 +1,39 @@
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional
-from datetime import datetime
-from app.models.user import UserRole, SubscriptionStatus
+import re
+from functools import lru_cache
+from email_validator import validate_email
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Annotated, Optional
+from app.models.user import UserRole
+from app.schemas.subscription import SubscriptionStatus
+from app.schemas.base import DbDatetime, TrustedOrm
+
+# pydantic-core's regex engine has no lookaround, so the strength rule stays in Python
+_PW_RE = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).{8,}$')
+
+
+def _check_password(v: str) -> str:
+    if not _PW_RE.match(v):
+        raise ValueError(
+            'Password must be at least 8 characters long and contain an uppercase letter, '
+            'a lowercase letter and a digit'
+        )
+    return v
+
+
+PasswordStr = Annotated[str, AfterValidator(_check_password)]
+
+
+@lru_cache(maxsize=4096)
+def _normalize_email(v: str) -> str:
+    # Syntax check only; repeated logins for the same address hit the cache
+    return validate_email(v, check_deliverability=False, allow_smtputf8=False).normalized
+
+
+FastEmail = Annotated[str, AfterValidator(_normalize_email)]
 
 
 class UserBase(BaseModel):
-    email: EmailStr
+    email: FastEmail
     username: str
     full_name: Optional[str] = None
     phone: Optional[str] = None
@@ -14,24 +42,12 @@ class UserBase(BaseModel):
 
 
 class UserCreate(UserBase):
-    password: str
+    username: str = Field(..., min_length=3)
+    password: PasswordStr
     
-    @validator('password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        return v
-    
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def validate_username(cls, v):
-        if len(v) < 3:
-            raise ValueError('Username must be at least 3 characters long')
         if not v.isalnum():
             raise ValueError('Username must contain only alphanumeric characters')
         return v
@@ -45,23 +61,32 @@ class UserUpdate(BaseModel):
     avatar_url: Optional[str] = None
 
 
-class UserResponse(UserBase):
+class UserResponse(TrustedOrm):
+    # UserBase fields are declared inline so the schema builds without merging bases
+    email: FastEmail
+    username: str
+    full_name: Optional[str] = None
+    phone: Optional[str] = None
+    country: Optional[str] = None
+    timezone: str = "UTC"
     id: int
     role: UserRole
     is_active: bool
     is_verified: bool
     subscription_status: SubscriptionStatus
-    subscription_expires_at: Optional[datetime] = None
+    subscription_expires_at: Optional[DbDatetime] = None
     avatar_url: Optional[str] = None
-    created_at: datetime
-    last_login: Optional[datetime] = None
+    created_at: DbDatetime
+    last_login: Optional[DbDatetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True, extra='ignore', defer_build=True,
+        frozen=True, revalidate_instances='never'
+    )
 
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: FastEmail
     password: str
 
 
@@ -78,46 +103,36 @@ class TokenRefresh(BaseModel):
 
 class PasswordChange(BaseModel):
     current_password: str
-    new_password: str
-    
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+    new_password: PasswordStr
 
 
 class PasswordReset(BaseModel):
-    email: EmailStr
+    email: FastEmail
 
 
 class PasswordResetConfirm(BaseModel):
     token: str
-    new_password: str
-    
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    new_password: PasswordStr
 
 
 class EmailVerification(BaseModel):
     token: str
 
 
-class UserStats(BaseModel):
+class UserStats(TrustedOrm):
     total_trades: int
     successful_trades: int
     total_profit: float
     win_rate: float
     active_signals: int
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(
+        from_attributes=True, extra='ignore', defer_build=True,
+        frozen=True, revalidate_instances='never'
+    )
+
+# Request body validators, used with app.api.deps.parse_body
+UserCreateAdapter = TypeAdapter(UserCreate)
+UserLoginAdapter = TypeAdapter(UserLogin)
+PasswordChangeAdapter = TypeAdapter(PasswordChange)
+PasswordResetConfirmAdapter = TypeAdapter(PasswordResetConfirm)
@@ -4,10 +4,13 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
 import logging
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import ta
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.ensemble import HistGradientBoostingClassifier
+import talib
+from numba import njit
+import onnxruntime
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
 import MetaTrader5 as mt5
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -15,16 +18,100 @@ from sqlalchemy import select
 from app.models.trading_signal import TradingSignal
 from app.models.trade import Trade
 from app.core.config import settings
+from app.services.mt5_service import mt5_service
 
 logger = logging.getLogger(__name__)
 
+# Fields of MT5 rate records used by the indicator pipeline
+_RATE_COLUMNS = ('open', 'high', 'low', 'close', 'tick_volume')
+
+# Model inputs, in the order they are stacked into the feature matrix (lags are appended after)
+_FEATURE_COLUMNS = (
+    'sma_20', 'sma_50', 'ema_12', 'ema_26',
+    'bb_width', 'rsi', 'macd', 'macd_signal', 'macd_histogram',
+    'stoch_k', 'stoch_d', 'atr', 'price_change', 'high_low_ratio',
+    'open_close_ratio', 'price_above_sma20', 'price_above_sma50', 'sma20_above_sma50'
+)
+_LAGGED_COLUMNS = ('close', 'rsi', 'macd')
+# Latest-bar values read by _build_signal
+_SIGNAL_COLUMNS = ('close', 'atr', 'rsi', 'macd')
+# Retraining grows the existing model by this many boosting rounds; every
+# _FULL_RETRAIN_EVERY-th retrain rebuilds it from scratch instead
+_WARM_START_ITERATIONS = 20
+_FULL_RETRAIN_EVERY = 5
+
+
+def _future_returns(close: np.ndarray, lookahead: int) -> np.ndarray:
+    """Return over the next `lookahead` bars (NaN for the last `lookahead` bars)."""
+    n = len(close) - lookahead
+    future_return = np.empty_like(close)
+    future_return[:n] = close[lookahead:] / close[:n] - 1
+    future_return[n:] = np.nan
+    return future_return
+
+
+def _lag(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shift an array forward by `periods`, filling the gap with NaN."""
+    lagged = np.empty_like(values, dtype=np.float64)
+    lagged[:periods] = np.nan
+    lagged[periods:] = values[:-periods]
+    return lagged
+
+
+@njit(cache=True)
+def _simulate_trades(predictions, closes, initial_balance):
+    """Walk per-bar predictions (1 buy, -1 sell, 0 hold) through a one-position-at-a-time book.
+    
+    A position opens on the first non-hold signal and closes on the opposite signal,
+    sized at 10% of the current balance. Returns the final balance and per-trade arrays.
+    """
+    n = len(predictions)
+    directions = np.empty(n, dtype=np.int64)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    profits = np.empty(n, dtype=np.float64)
+    
+    balance = initial_balance
+    position = 0
+    entry_price = 0.0
+    entry_at = 0
+    size = 0.0
+    count = 0
+    
+    for i in range(n):
+        prediction = predictions[i]
+        current_price = closes[i]
+        if position == 0:
+            if prediction != 0:
+                position = 1 if prediction == 1 else -1
+                entry_price = current_price
+                entry_at = i
+                size = balance * 0.1 / current_price  # Risk 10% per trade
+        elif prediction == -position:
+            profit = (current_price - entry_price) * size * position
+            balance += profit
+            directions[count] = position
+            entry_idx[count] = entry_at
+            exit_idx[count] = i
+            profits[count] = profit
+            count += 1
+            position = 0
+    
+    return balance, directions[:count], entry_idx[:count], exit_idx[:count], profits[:count]
+
 
 class AITradingService:
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
         self.is_trained = False
         self.feature_columns = []
+        # (symbol, timeframe) -> (last bar time, last close, (latest feature row, latest indicator values) or None)
+        self._indicator_cache: Dict[Tuple[str, str], Tuple[pd.Timestamp, float, Optional[Tuple[np.ndarray, Dict[str, float]]]]] = {}
+        # Indicator and feature work only; terminal calls go through mt5_service
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        self._ort = None  # ONNX Runtime session for the trained model, if export succeeded
+        self._warm_starts = 0  # warm-started retrains since the last full fit
+        self._fit_on: Optional[Tuple[str, str]] = None  # (symbol, timeframe) the model was last fit on
         
     async def get_market_data(self, symbol: str, timeframe: str = "H1", count: int = 1000) -> Optional[pd.DataFrame]:
         """Get historical market data for analysis."""
@@ -42,16 +129,18 @@ class AITradingService:
             
             mt5_timeframe = timeframe_map.get(timeframe, mt5.TIMEFRAME_H1)
             
-            # Get rates
-            rates = mt5.copy_rates_from_pos(symbol, mt5_timeframe, 0, count)
+            # Get rates on the shared terminal thread, serialized with order traffic
+            rates = await mt5_service.copy_rates(symbol, mt5_timeframe, count)
             if rates is None or len(rates) == 0:
                 logger.error(f"No data received for {symbol}")
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
+            # Build the frame straight from the structured array's OHLCV fields with a precomputed time index
+            index = pd.DatetimeIndex(rates['time'].astype('datetime64[s]'), name='time')
+            df = pd.DataFrame(
+                {name: rates[name] for name in _RATE_COLUMNS if name in rates.dtype.names},
+                index=index
+            )
             
             return df
             
@@ -62,57 +151,76 @@ class AITradingService:
     def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators for the dataset."""
         try:
-            # Price-based indicators
-            df['sma_20'] = ta.trend.sma_indicator(df['close'], window=20)
-            df['sma_50'] = ta.trend.sma_indicator(df['close'], window=50)
-            df['ema_12'] = ta.trend.ema_indicator(df['close'], window=12)
-            df['ema_26'] = ta.trend.ema_indicator(df['close'], window=26)
-            
-            # Bollinger Bands
-            bb = ta.volatility.BollingerBands(df['close'])
-            df['bb_upper'] = bb.bollinger_hband()
-            df['bb_middle'] = bb.bollinger_mavg()
-            df['bb_lower'] = bb.bollinger_lband()
-            df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
-            
-            # RSI
-            df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-            
-            # MACD
-            macd = ta.trend.MACD(df['close'])
-            df['macd'] = macd.macd()
-            df['macd_signal'] = macd.macd_signal()
-            df['macd_histogram'] = macd.macd_diff()
-            
-            # Stochastic
-            stoch = ta.momentum.StochasticOscillator(df['high'], df['low'], df['close'])
-            df['stoch_k'] = stoch.stoch()
-            df['stoch_d'] = stoch.stoch_signal()
-            
-            # ATR (Average True Range)
-            df['atr'] = ta.volatility.average_true_range(df['high'], df['low'], df['close'])
-            
-            # Volume indicators (if volume data available)
-            if 'tick_volume' in df.columns:
-                df['volume_sma'] = ta.volume.volume_sma(df['close'], df['tick_volume'])
-                df['volume_ratio'] = df['tick_volume'] / df['volume_sma']
-            
-            # Price patterns
-            df['price_change'] = df['close'].pct_change()
-            df['high_low_ratio'] = (df['high'] - df['low']) / df['close']
-            df['open_close_ratio'] = (df['close'] - df['open']) / df['open']
-            
-            # Trend indicators
-            df['price_above_sma20'] = (df['close'] > df['sma_20']).astype(int)
-            df['price_above_sma50'] = (df['close'] > df['sma_50']).astype(int)
-            df['sma20_above_sma50'] = (df['sma_20'] > df['sma_50']).astype(int)
-            
-            return df
+            return df.assign(**self._indicator_arrays(df))
             
         except Exception as e:
             logger.error(f"Error calculating technical indicators: {str(e)}")
             return df
     
+    def _indicator_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Compute every indicator column as a NumPy array keyed by column name."""
+        # Raw arrays for TA-Lib's C routines
+        close = df['close'].to_numpy(np.float64)
+        high = df['high'].to_numpy(np.float64)
+        low = df['low'].to_numpy(np.float64)
+        open_ = df['open'].to_numpy(np.float64)
+        
+        cols = {}
+        
+        # Price-based indicators
+        cols['sma_20'] = talib.SMA(close, timeperiod=20)
+        cols['sma_50'] = talib.SMA(close, timeperiod=50)
+        cols['ema_12'] = talib.EMA(close, timeperiod=12)
+        cols['ema_26'] = talib.EMA(close, timeperiod=26)
+        
+        # Bollinger Bands
+        cols['bb_upper'], cols['bb_middle'], cols['bb_lower'] = talib.BBANDS(
+            close, timeperiod=20, nbdevup=2, nbdevdn=2
+        )
+        cols['bb_width'] = (cols['bb_upper'] - cols['bb_lower']) / cols['bb_middle']
+        
+        # RSI
+        cols['rsi'] = talib.RSI(close, timeperiod=14)
+        
+        # MACD
+        cols['macd'], cols['macd_signal'], cols['macd_histogram'] = talib.MACD(
+            close, fastperiod=12, slowperiod=26, signalperiod=9
+        )
+        
+        # Stochastic (fast %K over 14 bars, %D as its 3-bar SMA)
+        cols['stoch_k'], cols['stoch_d'] = talib.STOCHF(high, low, close, fastk_period=14, fastd_period=3)
+        
+        # ATR (Average True Range)
+        cols['atr'] = talib.ATR(high, low, close, timeperiod=14)
+        
+        # Volume indicators (if volume data available)
+        if 'tick_volume' in df.columns:
+            volume = df['tick_volume'].to_numpy(np.float64)
+            cols['volume_sma'] = talib.SMA(volume, timeperiod=20)
+            cols['volume_ratio'] = volume / cols['volume_sma']
+        
+        # Price patterns
+        price_change = np.empty_like(close)
+        price_change[0] = np.nan
+        np.divide(close[1:], close[:-1], out=price_change[1:])
+        price_change[1:] -= 1
+        cols['price_change'] = price_change
+        
+        high_low_ratio = np.subtract(high, low)
+        np.divide(high_low_ratio, close, out=high_low_ratio)
+        cols['high_low_ratio'] = high_low_ratio
+        
+        open_close_ratio = np.subtract(close, open_)
+        np.divide(open_close_ratio, open_, out=open_close_ratio)
+        cols['open_close_ratio'] = open_close_ratio
+        
+        # Trend indicators
+        cols['price_above_sma20'] = (close > cols['sma_20']).astype(int)
+        cols['price_above_sma50'] = (close > cols['sma_50']).astype(int)
+        cols['sma20_above_sma50'] = (cols['sma_20'] > cols['sma_50']).astype(int)
+        
+        return cols
+    
     def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare features for ML model."""
         try:
@@ -120,15 +228,10 @@ class AITradingService:
             df = self.calculate_technical_indicators(df)
             
             # Select features for the model
-            feature_columns = [
-                'sma_20', 'sma_50', 'ema_12', 'ema_26',
-                'bb_width', 'rsi', 'macd', 'macd_signal', 'macd_histogram',
-                'stoch_k', 'stoch_d', 'atr', 'price_change', 'high_low_ratio',
-                'open_close_ratio', 'price_above_sma20', 'price_above_sma50', 'sma20_above_sma50'
-            ]
+            feature_columns = list(_FEATURE_COLUMNS)
             
             # Add lagged features
-            for col in ['close', 'rsi', 'macd']:
+            for col in _LAGGED_COLUMNS:
                 if col in df.columns:
                     df[f'{col}_lag1'] = df[col].shift(1)
                     df[f'{col}_lag2'] = df[col].shift(2)
@@ -137,32 +240,56 @@ class AITradingService:
             # Store feature columns
             self.feature_columns = [col for col in feature_columns if col in df.columns]
             
-            # Drop rows with NaN values
-            df = df.dropna()
-            
+            # Indicator warm-up rows are still NaN here; callers drop them
             return df
             
         except Exception as e:
             logger.error(f"Error preparing features: {str(e)}")
             return df
     
+    def _feature_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """Feature rows as one C-contiguous float64 block (the dtype the histogram binning expects)."""
+        return np.ascontiguousarray(df[self.feature_columns].to_numpy(np.float64))
+    
     def create_labels(self, df: pd.DataFrame, lookahead: int = 5, threshold: float = 0.001) -> pd.DataFrame:
         """Create labels for supervised learning."""
         try:
-            # Calculate future returns
-            df['future_return'] = df['close'].shift(-lookahead) / df['close'] - 1
+            # Calculate future returns (unknown for the last `lookahead` bars)
+            future_return = _future_returns(df['close'].to_numpy(np.float64), lookahead)
             
             # Create labels: 1 for buy, 0 for hold, -1 for sell
-            df['label'] = 0  # Default to hold
-            df.loc[df['future_return'] > threshold, 'label'] = 1  # Buy signal
-            df.loc[df['future_return'] < -threshold, 'label'] = -1  # Sell signal
+            labels = np.where(future_return > threshold, 1, np.where(future_return < -threshold, -1, 0))
             
-            return df
+            return df.assign(future_return=future_return, label=labels.astype(np.int8))
             
         except Exception as e:
             logger.error(f"Error creating labels: {str(e)}")
             return df
     
+    def _build_training_matrix(self, df: pd.DataFrame, lookahead: int = 5,
+                               threshold: float = 0.001) -> Tuple[np.ndarray, np.ndarray]:
+        """Build (X, y) for training from raw bars in one pass over NumPy arrays.
+        
+        Same features and labels as prepare_features + create_labels, without the
+        intermediate DataFrames; rows with a non-finite feature or unknown future return are dropped.
+        """
+        cols = self._indicator_arrays(df)
+        cols['close'] = df['close'].to_numpy(np.float64)
+        
+        feature_columns = list(_FEATURE_COLUMNS)
+        for col in _LAGGED_COLUMNS:
+            cols[f'{col}_lag1'] = _lag(cols[col], 1)
+            cols[f'{col}_lag2'] = _lag(cols[col], 2)
+            feature_columns.extend([f'{col}_lag1', f'{col}_lag2'])
+        self.feature_columns = [col for col in feature_columns if col in cols]
+        
+        X = np.column_stack([cols[col] for col in self.feature_columns]).astype(np.float64, copy=False)
+        future_return = _future_returns(cols['close'], lookahead)
+        y = np.where(future_return > threshold, 1, np.where(future_return < -threshold, -1, 0)).astype(np.int8)
+        
+        mask = np.isfinite(X).all(axis=1) & np.isfinite(future_return)
+        return X[mask], y[mask]
+    
     async def train_model(self, symbol: str, timeframe: str = "H1") -> bool:
         """Train the AI model with historical data."""
         try:
@@ -174,48 +301,59 @@ class AITradingService:
                 logger.error(f"Insufficient data for training {symbol}")
                 return False
             
-            # Prepare features and labels
-            df = self.prepare_features(df)
-            df = self.create_labels(df)
-            
-            # Remove rows with NaN values
-            df = df.dropna()
+            # Prepare training data
+            X, y = self._build_training_matrix(df)
             
-            if len(df) < 100:
+            if len(X) < 100:
                 logger.error(f"Insufficient clean data for training {symbol}")
                 return False
             
-            # Prepare training data
-            X = df[self.feature_columns].values
-            y = df['label'].values
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
-            )
-            
-            # Scale features
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
-            
-            # Train model
-            self.model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=10,
-                min_samples_split=5,
-                min_samples_leaf=2,
-                random_state=42,
-                n_jobs=-1
+            # Stratified 80/20 split: shuffle each label's rows and hold out the first 20% of each
+            rng = np.random.default_rng(42)
+            per_class = [rng.permutation(np.flatnonzero(y == label)) for label in np.unique(y)]
+            test_idx = np.concatenate([idx[:int(0.2 * len(idx))] for idx in per_class])
+            train_idx = np.concatenate([idx[int(0.2 * len(idx)):] for idx in per_class])
+            X_train, X_test, y_train, y_test = X[train_idx], X[test_idx], y[train_idx], y[test_idx]
+            
+            # Retrain by adding boosting rounds to the current model when it was fit on the same
+            # symbol and timeframe, otherwise (or every _FULL_RETRAIN_EVERY retrains) fit from scratch
+            warm_start = (
+                self.is_trained
+                and self._fit_on == (symbol, timeframe)
+                and self._warm_starts < _FULL_RETRAIN_EVERY
+                and self.model.n_features_in_ == X.shape[1]
+                and np.array_equal(self.model.classes_, np.unique(y_train))
             )
-            
-            self.model.fit(X_train_scaled, y_train)
+            if warm_start:
+                # Early stopping would end the refresh after a round or two, so add the rounds outright
+                self.model.set_params(
+                    max_iter=self.model.n_iter_ + _WARM_START_ITERATIONS,
+                    early_stopping=False
+                )
+                self._warm_starts += 1
+            else:
+                # Histogram-binned trees are scale-invariant, so no feature scaling
+                self.model = HistGradientBoostingClassifier(
+                    max_iter=200,
+                    max_depth=8,
+                    learning_rate=0.05,
+                    early_stopping=True,
+                    validation_fraction=0.1,
+                    warm_start=True,
+                    random_state=42
+                )
+                self._warm_starts = 0
+            
+            self.model.fit(X_train, y_train)
+            self._fit_on = (symbol, timeframe)
             
             # Evaluate model
-            train_score = self.model.score(X_train_scaled, y_train)
-            test_score = self.model.score(X_test_scaled, y_test)
+            train_score = self.model.score(X_train, y_train)
+            test_score = self.model.score(X_test, y_test)
             
             logger.info(f"Model trained - Train Score: {train_score:.4f}, Test Score: {test_score:.4f}")
             
+            self._ort = self._export_onnx()
             self.is_trained = True
             return True
             
@@ -223,6 +361,103 @@ class AITradingService:
             logger.error(f"Error training model: {str(e)}")
             return False
     
+    def _export_onnx(self) -> Optional[onnxruntime.InferenceSession]:
+        """Compile the trained model into an ONNX Runtime session for low-latency inference."""
+        try:
+            onx = convert_sklearn(
+                self.model,
+                initial_types=[('X', FloatTensorType([None, len(self.feature_columns)]))],
+                options={id(self.model): {'zipmap': False}},
+                target_opset={'': 17, 'ai.onnx.ml': 3}
+            )
+            return onnxruntime.InferenceSession(onx.SerializeToString(), providers=['CPUExecutionProvider'])
+        except Exception as e:
+            logger.error(f"Error exporting model to ONNX, falling back to sklearn: {str(e)}")
+            return None
+    
+    def _predict_proba(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (predicted labels, class probabilities) for the rows of X."""
+        if self._ort is not None:
+            _, probabilities = self._ort.run(None, {'X': X.astype(np.float32)})
+        else:
+            probabilities = self.model.predict_proba(X)
+        return self.model.classes_[probabilities.argmax(axis=1)], probabilities
+    
+    async def _prepare_latest(self, symbol: str, timeframe: str) -> Optional[Tuple[np.ndarray, Dict[str, float]]]:
+        """Fetch recent bars and return the latest bar's feature row and indicator values, or None if there is too little data."""
+        df = await self.get_market_data(symbol, timeframe, count=100)
+        if df is None or len(df) < 50:
+            return None
+        
+        # Reuse the prepared snapshot while the latest bar is unchanged
+        cache_key = (symbol, timeframe)
+        last_time = df.index[-1]
+        last_close = float(df['close'].to_numpy()[-1])
+        cached = self._indicator_cache.get(cache_key)
+        if cached is not None and cached[0] == last_time and cached[1] == last_close:
+            return cached[2]
+        
+        # Indicators are CPU-bound, so compute them on the worker pool
+        latest = await asyncio.get_running_loop().run_in_executor(self._pool, self._latest_snapshot, df)
+        self._indicator_cache[cache_key] = (last_time, last_close, latest)
+        return latest
+    
+    def _latest_snapshot(self, df: pd.DataFrame) -> Optional[Tuple[np.ndarray, Dict[str, float]]]:
+        """Prepare features, then keep only the last row as plain arrays/floats."""
+        df = self.prepare_features(df)
+        df = df.dropna()
+        if len(df) == 0:
+            return None
+        return (
+            self._feature_matrix(df)[-1:],
+            {name: float(df[name].to_numpy()[-1]) for name in _SIGNAL_COLUMNS if name in df.columns}
+        )
+    
+    def _build_signal(self, symbol: str, timeframe: str, latest: Dict[str, float],
+                      prediction, prediction_proba: np.ndarray) -> Optional[Dict]:
+        """Turn a model prediction for the latest bar into signal data (None for hold)."""
+        # Get current price data
+        current_price = latest['close']
+        atr = latest.get('atr', current_price * 0.01)
+        
+        # Generate signal based on prediction
+        if prediction == 1:  # Buy signal
+            signal_type = "buy"
+            confidence = prediction_proba[2] if len(prediction_proba) > 2 else prediction_proba[1]
+            entry_price = current_price
+            stop_loss = current_price - (2 * atr)
+            take_profit = current_price + (3 * atr)
+        elif prediction == -1:  # Sell signal
+            signal_type = "sell"
+            confidence = prediction_proba[0]
+            entry_price = current_price
+            stop_loss = current_price + (2 * atr)
+            take_profit = current_price - (3 * atr)
+        else:  # Hold
+            return None
+        
+        # Calculate additional metrics
+        risk_reward_ratio = abs(take_profit - entry_price) / abs(entry_price - stop_loss)
+        
+        signal_data = {
+            'symbol': symbol,
+            'signal_type': signal_type,
+            'confidence_score': float(confidence),
+            'entry_price': float(entry_price),
+            'stop_loss': float(stop_loss),
+            'take_profit': float(take_profit),
+            'risk_reward_ratio': float(risk_reward_ratio),
+            'timeframe': timeframe,
+            'analysis_data': {
+                'prediction_probabilities': prediction_proba.tolist(),
+                'atr': float(atr),
+                'rsi': latest.get('rsi'),
+                'macd': latest.get('macd')
+            }
+        }
+        
+        return signal_data
+    
     async def generate_signal(self, symbol: str, timeframe: str = "H1") -> Optional[Dict]:
         """Generate trading signal for a symbol."""
         try:
@@ -232,70 +467,46 @@ class AITradingService:
                     return None
             
             # Get recent data
-            df = await self.get_market_data(symbol, timeframe, count=100)
-            if df is None or len(df) < 50:
+            prepared = await self._prepare_latest(symbol, timeframe)
+            if prepared is None:
                 return None
-            
-            # Prepare features
-            df = self.prepare_features(df)
-            df = df.dropna()
-            
-            if len(df) == 0:
-                return None
-            
-            # Get latest features
-            latest_features = df[self.feature_columns].iloc[-1:].values
-            latest_features_scaled = self.scaler.transform(latest_features)
+            latest_features, latest = prepared
             
             # Make prediction
-            prediction = self.model.predict(latest_features_scaled)[0]
-            prediction_proba = self.model.predict_proba(latest_features_scaled)[0]
-            
-            # Get current price data
-            current_price = df['close'].iloc[-1]
-            atr = df['atr'].iloc[-1] if 'atr' in df.columns else current_price * 0.01
+            predictions, probabilities = self._predict_proba(latest_features)
             
-            # Generate signal based on prediction
-            if prediction == 1:  # Buy signal
-                signal_type = "buy"
-                confidence = prediction_proba[2] if len(prediction_proba) > 2 else prediction_proba[1]
-                entry_price = current_price
-                stop_loss = current_price - (2 * atr)
-                take_profit = current_price + (3 * atr)
-            elif prediction == -1:  # Sell signal
-                signal_type = "sell"
-                confidence = prediction_proba[0]
-                entry_price = current_price
-                stop_loss = current_price + (2 * atr)
-                take_profit = current_price - (3 * atr)
-            else:  # Hold
-                return None
+            return self._build_signal(symbol, timeframe, latest, predictions[0], probabilities[0])
             
-            # Calculate additional metrics
-            risk_reward_ratio = abs(take_profit - entry_price) / abs(entry_price - stop_loss)
-            
-            signal_data = {
-                'symbol': symbol,
-                'signal_type': signal_type,
-                'confidence_score': float(confidence),
-                'entry_price': float(entry_price),
-                'stop_loss': float(stop_loss),
-                'take_profit': float(take_profit),
-                'risk_reward_ratio': float(risk_reward_ratio),
-                'timeframe': timeframe,
-                'analysis_data': {
-                    'prediction_probabilities': prediction_proba.tolist(),
-                    'atr': float(atr),
-                    'rsi': float(df['rsi'].iloc[-1]) if 'rsi' in df.columns else None,
-                    'macd': float(df['macd'].iloc[-1]) if 'macd' in df.columns else None
+        except Exception as e:
+            logger.error(f"Error generating signal for {symbol}: {str(e)}")
+            return None
+    
+    async def generate_signals(self, symbols: List[str], timeframe: str = "H1") -> List[Optional[Dict]]:
+        """Generate trading signals for several symbols with a single model call."""
+        try:
+            if not self.is_trained:
+                logger.warning("Model not trained, training now...")
+                if not symbols or not await self.train_model(symbols[0], timeframe):
+                    return [None] * len(symbols)
+            
+            # Fetch each distinct symbol concurrently, then score all latest rows in one predict call
+            unique_symbols = list(dict.fromkeys(symbols))
+            frames = await asyncio.gather(*(self._prepare_latest(symbol, timeframe) for symbol in unique_symbols))
+            ready = [(symbol, prepared) for symbol, prepared in zip(unique_symbols, frames) if prepared is not None]
+            signals = {}
+            if ready:
+                latest_features = np.vstack([features for _, (features, _) in ready])
+                predictions, probabilities = self._predict_proba(latest_features)
+                signals = {
+                    symbol: self._build_signal(symbol, timeframe, latest, prediction, prediction_proba)
+                    for (symbol, (_, latest)), prediction, prediction_proba in zip(ready, predictions, probabilities)
                 }
-            }
             
-            return signal_data
+            return [signals.get(symbol) for symbol in symbols]
             
         except Exception as e:
-            logger.error(f"Error generating signal for {symbol}: {str(e)}")
-            return None
+            logger.error(f"Error generating signals for {symbols}: {str(e)}")
+            return [None] * len(symbols)
     
     async def analyze_market_sentiment(self, symbols: List[str]) -> Dict:
         """Analyze overall market sentiment across multiple symbols."""
@@ -311,8 +522,17 @@ class AITradingService:
             total_confidence = 0
             signal_count = 0
             
+            timeframe = "H1"
             for symbol in symbols:
-                signal = await self.generate_signal(symbol)
+                if self.is_trained:
+                    break
+                await self.train_model(symbol, timeframe)
+            
+            signals = []
+            if self.is_trained:
+                signals = zip(symbols, await self.generate_signals(symbols, timeframe))
+            
+            for symbol, signal in signals:
                 if signal:
                     sentiment_data['symbol_analysis'][symbol] = signal
                     
@@ -366,73 +586,41 @@ class AITradingService:
             
             # Simulate trading
             initial_balance = 10000
-            balance = initial_balance
-            position = None
-            trades = []
-            
-            for i in range(50, len(df)):  # Start after enough data for indicators
-                current_data = df.iloc[:i+1]
-                
-                # Generate signal
-                features = current_data[self.feature_columns].iloc[-1:].values
-                if self.is_trained:
-                    features_scaled = self.scaler.transform(features)
-                    prediction = self.model.predict(features_scaled)[0]
-                else:
-                    continue
-                
-                current_price = current_data['close'].iloc[-1]
-                
-                # Execute trades based on signals
-                if position is None and prediction != 0:
-                    # Open position
-                    position = {
-                        'type': 'buy' if prediction == 1 else 'sell',
-                        'entry_price': current_price,
-                        'entry_time': current_data.index[-1],
-                        'size': balance * 0.1 / current_price  # Risk 10% per trade
-                    }
-                
-                elif position is not None:
-                    # Check exit conditions
-                    should_exit = False
-                    exit_reason = ""
-                    
-                    if position['type'] == 'buy' and prediction == -1:
-                        should_exit = True
-                        exit_reason = "Signal reversal"
-                    elif position['type'] == 'sell' and prediction == 1:
-                        should_exit = True
-                        exit_reason = "Signal reversal"
-                    
-                    if should_exit:
-                        # Close position
-                        if position['type'] == 'buy':
-                            profit = (current_price - position['entry_price']) * position['size']
-                        else:
-                            profit = (position['entry_price'] - current_price) * position['size']
-                        
-                        balance += profit
-                        
-                        trades.append({
-                            'entry_time': position['entry_time'],
-                            'exit_time': current_data.index[-1],
-                            'type': position['type'],
-                            'entry_price': position['entry_price'],
-                            'exit_price': current_price,
-                            'profit': profit,
-                            'exit_reason': exit_reason
-                        })
-                        
-                        position = None
-            
-            # Calculate performance metrics
+            
+            # Indicators are already computed on the full frame, so predict every bar in one call
+            start = 50  # Start after enough data for indicators
+            if self.is_trained:
+                features = self._feature_matrix(df.iloc[start:])
+                predictions = self._predict_proba(features)[0].astype(np.int64)
+            else:
+                predictions = np.zeros(0, dtype=np.int64)
+            closes = df['close'].to_numpy(np.float64)[start:start + len(predictions)]
+            times = df.index[start:]
+            
+            balance, directions, entry_idx, exit_idx, profits = _simulate_trades(
+                predictions, closes, float(initial_balance)
+            )
+            
+            # Metrics come straight from the per-trade arrays; dicts are only built for the returned tail
+            num_trades = len(profits)
             total_return = (balance - initial_balance) / initial_balance * 100
-            num_trades = len(trades)
-            winning_trades = len([t for t in trades if t['profit'] > 0])
+            winning_trades = int((profits > 0).sum())
             win_rate = winning_trades / num_trades * 100 if num_trades > 0 else 0
             
-            avg_profit = sum([t['profit'] for t in trades]) / num_trades if num_trades > 0 else 0
+            avg_profit = float(profits.sum()) / num_trades if num_trades > 0 else 0
+            
+            trades = [
+                {
+                    'entry_time': times[entry_idx[t]],
+                    'exit_time': times[exit_idx[t]],
+                    'type': 'buy' if directions[t] == 1 else 'sell',
+                    'entry_price': closes[entry_idx[t]],
+                    'exit_price': closes[exit_idx[t]],
+                    'profit': profits[t],
+                    'exit_reason': "Signal reversal"
+                }
+                for t in range(max(num_trades - 10, 0), num_trades)
+            ]
             
             return {
                 'initial_balance': initial_balance,
@@ -442,7 +630,7 @@ class AITradingService:
                 'winning_trades': winning_trades,
                 'win_rate_pct': win_rate,
                 'average_profit_per_trade': avg_profit,
-                'trades': trades[-10:]  # Return last 10 trades
+                'trades': trades  # Last 10 trades
             }
             
         except Exception as e:
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsService:
+    """Serves admin analytics from pre-aggregated materialized views."""
+
+    def __init__(self):
+        self.running = False
+
+    async def refresh_pair_stats(self):
+        """Refresh the mv_pair_stats materialized view without blocking readers."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_pair_stats"))
+                await db.commit()
+            logger.info("Refreshed mv_pair_stats")
+        except Exception as e:
+            logger.error(f"Error refreshing mv_pair_stats: {str(e)}")
+
+    async def get_top_pairs(self, db: AsyncSession, limit: int = 10) -> List[Dict]:
+        """Get the most traded pairs with profit and win rate."""
+        result = await db.execute(
+            text(
+                "SELECT symbol, trade_count, total_profit, win_rate "
+                "FROM mv_pair_stats ORDER BY trade_count DESC LIMIT :limit"
+            ),
+            {"limit": limit}
+        )
+        return [
+            {
+                "symbol": row.symbol,
+                "trade_count": row.trade_count,
+                "total_profit": round(float(row.total_profit or 0), 2),
+                "win_rate": round(float(row.win_rate or 0) * 100, 2)
+            }
+            for row in result
+        ]
+
+    async def start_refresh_loop(self):
+        """Periodically refresh the analytics materialized views."""
+        self.running = True
+        logger.info("Analytics refresh loop started")
+
+        while self.running:
+            await self.refresh_pair_stats()
+            await asyncio.sleep(settings.ANALYTICS_REFRESH_INTERVAL)
+
+    def stop_refresh_loop(self):
+        """Stop the analytics refresh loop."""
+        self.running = False
+
+
+# Global analytics service instance
+analytics_service = AnalyticsService()
@@ -1,33 +1,140 @@
 import asyncio
-import json
+import heapq
+import itertools
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import random
+import time
+from collections import Counter, defaultdict
 import numpy as np
+import orjson
+import websockets
+from websockets.server import WebSocketServerProtocol
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, insert
 
-from app.core.database import get_async_session
+from app.core.database import AsyncSessionLocal
 from app.models.trading_signal import TradingSignal, SignalType, SignalStatus
 from app.services.ai_service import ai_service
+from app.services.mt5_service import mt5_service
 
 logger = logging.getLogger(__name__)
 
+# Generated signals are written to the database in batches
+_SIGNAL_FLUSH_INTERVAL = 2  # seconds
+_SIGNAL_FLUSH_BATCH = 50
+
+# Uniform draws are taken from numpy in bulk and handed out from a pool
+_RNG_BATCH = 4096
+
+# High-volatility pairs used for scalping
+_SCALPING_SYMBOLS = ('EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD')
+
+_TRENDS = ('BULLISH', 'BEARISH', 'SIDEWAYS')
+_MACD_SIGNALS = ('BUY', 'SELL', 'NEUTRAL')
+_SENTIMENTS = ('BULLISH', 'BEARISH', 'NEUTRAL')
+_MOCK_SENTIMENTS = ('bullish', 'bearish', 'neutral')
+_MA_TRENDS = ('up', 'down', 'sideways')
+_SIGNAL_SIDES = ('buy', 'sell')
+
+# Mock signal tables: base prices, confidence range and (stop loss, take profit) fractions per style
+_BASE_PRICES = {
+    'EURUSD': 1.0850, 'GBPUSD': 1.2650, 'USDJPY': 149.50,
+    'USDCHF': 0.8750, 'AUDUSD': 0.6550, 'USDCAD': 1.3650,
+    'NZDUSD': 0.6150, 'EURJPY': 162.25, 'GBPJPY': 189.15,
+    'EURGBP': 0.8580, 'XAUUSD': 2650.00, 'BTCUSD': 45000.00,
+    'ETHUSD': 2800.00
+}
+_CONFIDENCE_RANGES = {
+    'scalping': (0.60, 0.75),
+    'intraday': (0.70, 0.85),
+    'swing': (0.75, 0.95)
+}
+_RISK_LEVELS = {
+    'scalping': (0.0005, 0.0010),
+    'intraday': (0.0015, 0.0030),
+    'swing': (0.0050, 0.0100)
+}
+
+# Signal lifetime in hours by style
+_SIGNAL_DURATIONS = {
+    'scalping': 1,
+    'intraday': 8,
+    'swing': 72
+}
+
+# Seconds an active signal is kept before cleanup expires it
+_SIGNAL_EXPIRY = {
+    'scalping': 30 * 60,
+    'intraday': 8 * 3600,
+    'swing': 3 * 86400
+}
+_DEFAULT_SIGNAL_EXPIRY = 3600
+
+# AI signals are reused for this many seconds within the same M15 bar
+_AI_CACHE_TTL = 60
+_AI_BAR_SECONDS = 15 * 60
+
+# Status updates arriving within this many seconds go out as one message
+_UPDATE_COALESCE_DELAY = 0.05
+
+# Seconds between checks of active signals' TP/SL levels against live quotes
+_LEVEL_CHECK_INTERVAL = 5
+
+# Statuses that end a signal
+_CLOSING_STATUSES = ('hit_tp', 'hit_sl')
+
+
+def _encode_message(message: Dict) -> str:
+    """Serialize a broadcast message once, as the text frame every subscriber receives."""
+    return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
 class RealtimeSignalService:
     """Service for generating and managing real-time trading signals"""
     
     def __init__(self):
         self.active_signals: Dict[str, Dict] = {}
-        self.subscribers: Set = set()
+        
+        # Signal ids are a per-process prefix plus a counter, unique across restarts
+        self._id_prefix = f"{time.time_ns():x}"
+        self._signal_ids = itertools.count(1)
+        
+        # (expiry epoch, signal id) min-heap and running style/type counts for statistics
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._signal_counts: Counter = Counter()
+        self.subscribers: Set[WebSocketServerProtocol] = set()
+        self._has_subscribers = asyncio.Event()
+        
+        # (signal_id, status) changes reported by the price feed
+        self._status_events: asyncio.Queue = asyncio.Queue()
+        
+        # Status updates waiting for the next coalesced broadcast
+        self._update_batch: List[Dict] = []
+        self._update_flush: Optional[asyncio.TimerHandle] = None
         self.running = False
         
+        # Signal rows waiting for the next batched insert
+        self._pending_signals: List[Dict] = []
+        self._flush_lock = asyncio.Lock()
+        
+        # Pool of uniform [0, 1) draws for the mock analysis generators
+        self._rng = np.random.default_rng()
+        self._uniform_pool: List[float] = []
+        
+        # (symbol, timeframe, bar bucket) -> (fetched at, AI signal)
+        self._ai_cache: Dict[Tuple[str, str, int], Tuple[float, Dict]] = {}
+        
+        # Bulk-drawn index streams for symbol picks, one per sequence length
+        self._index_draws: Dict[int, Iterator[int]] = defaultdict(lambda: iter(()))
+        
         # Major currency pairs for signal generation
         self.symbols = [
             'EURUSD', 'GBPUSD', 'USDJPY', 'USDCHF', 'AUDUSD',
             'USDCAD', 'NZDUSD', 'EURJPY', 'GBPJPY', 'EURGBP',
             'XAUUSD', 'BTCUSD', 'ETHUSD'  # Added Gold and Crypto
         ]
+        self._symbols_tuple = tuple(self.symbols)
         
         # Signal generation intervals (in seconds)
         self.signal_intervals = {
@@ -47,7 +154,9 @@ class RealtimeSignalService:
             asyncio.create_task(self._generate_intraday_signals()),
             asyncio.create_task(self._generate_swing_signals()),
             asyncio.create_task(self._cleanup_expired_signals()),
-            asyncio.create_task(self._update_signal_status())
+            asyncio.create_task(self._update_signal_status()),
+            asyncio.create_task(self._watch_signal_levels()),
+            asyncio.create_task(self._flush_signals_to_db())
         ]
         
         await asyncio.gather(*tasks)
@@ -55,29 +164,39 @@ class RealtimeSignalService:
     async def stop_service(self):
         """Stop the signal generation service"""
         self.running = False
+        await self._flush_signals()
         logger.info("🛑 Real-time Signal Service stopped")
     
-    def add_subscriber(self, websocket):
+    def add_subscriber(self, websocket: WebSocketServerProtocol):
         """Add a WebSocket subscriber for real-time signals"""
         self.subscribers.add(websocket)
+        self._has_subscribers.set()
         logger.info(f"📡 New subscriber added. Total: {len(self.subscribers)}")
     
-    def remove_subscriber(self, websocket):
+    def report_signal_status(self, signal_id: str, status: str):
+        """Report a status change (e.g. 'hit_tp', 'hit_sl', 'modified') for an active signal; TP/SL hits end it"""
+        self._status_events.put_nowait((signal_id, status))
+    
+    def remove_subscriber(self, websocket: WebSocketServerProtocol):
         """Remove a WebSocket subscriber"""
         self.subscribers.discard(websocket)
+        if not self.subscribers:
+            self._has_subscribers.clear()
         logger.info(f"📡 Subscriber removed. Total: {len(self.subscribers)}")
     
     async def _generate_scalping_signals(self):
         """Generate high-frequency scalping signals with real-time market analysis"""
         while self.running:
             try:
-                # Generate 1-3 scalping signals with enhanced analysis
-                for _ in range(random.randint(1, 3)):
-                    # Select high-volatility pairs for scalping
-                    scalping_symbols = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD']
-                    symbol = random.choice(scalping_symbols)
-                    
-                    signal = await self._create_enhanced_ai_signal('scalping', symbol)
+                # Scalping signals are only worth generating while someone is listening
+                await self._has_subscribers.wait()
+                
+                # Generate 1-3 scalping signals with enhanced analysis, scoring the burst in one AI call
+                symbols = [self._pick(_SCALPING_SYMBOLS) for _ in range(random.randint(1, 3))]
+                ai_signals = await self._get_ai_signals(symbols, "M15")
+                
+                for symbol, ai_signal in zip(symbols, ai_signals):
+                    signal = await self._create_enhanced_ai_signal('scalping', symbol, ai_signal)
                     if signal and signal['confidence'] >= 0.75:  # Higher threshold for scalping
                         await self._broadcast_signal(signal)
                         await self._save_signal_to_db(signal)
@@ -122,17 +241,38 @@ class RealtimeSignalService:
                 logger.error(f"Error in swing signal generation: {e}")
                 await asyncio.sleep(600)
     
-    async def _create_enhanced_ai_signal(self, signal_style: str, symbol: str) -> Optional[Dict]:
+    def _next_signal_id(self, signal_style: str) -> str:
+        """Unique id for a newly generated signal"""
+        return f"{signal_style}_{self._id_prefix}_{next(self._signal_ids)}"
+    
+    async def _get_ai_signals(self, symbols: List[str], timeframe: str) -> List[Optional[Dict]]:
+        """Get AI signals, reusing recent results for the same bar and fetching the rest in one batch"""
+        now = time.time()
+        bucket = int(now) // _AI_BAR_SECONDS
+        results: Dict[str, Optional[Dict]] = {}
+        for symbol in symbols:
+            hit = self._ai_cache.get((symbol, timeframe, bucket))
+            if hit and now - hit[0] < _AI_CACHE_TTL:
+                results[symbol] = hit[1]
+        
+        missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in results]
+        if missing:
+            for symbol, ai_signal in zip(missing, await ai_service.generate_signals(missing, timeframe)):
+                results[symbol] = ai_signal
+                if ai_signal:
+                    self._ai_cache[(symbol, timeframe, bucket)] = (now, ai_signal)
+        
+        return [results[symbol] for symbol in symbols]
+    
+    async def _create_enhanced_ai_signal(self, signal_style: str, symbol: str, ai_signal: Optional[Dict]) -> Optional[Dict]:
         """Create enhanced AI-powered trading signal with real-time analysis"""
         try:
-            # Generate AI signal using the existing AI service
-            ai_signal = await ai_service.generate_signal(symbol, "M15")
-            
             if not ai_signal or ai_signal['confidence_score'] < 0.65:
                 return None
             
             # Create enhanced signal with real-time market data
-            signal_id = f"{signal_style}_{symbol}_{int(datetime.utcnow().timestamp())}"
+            now = datetime.utcnow()
+            signal_id = self._next_signal_id(signal_style)
             
             # Get real-time market analysis
             market_analysis = await self._get_market_analysis(symbol)
@@ -151,8 +291,8 @@ class RealtimeSignalService:
                 'risk_reward_ratio': ai_signal['risk_reward_ratio'],
                 'timeframe': ai_signal['timeframe'],
                 'signal_style': signal_style,
-                'timestamp': datetime.utcnow().isoformat(),
-                'expires_at': (datetime.utcnow() + timedelta(hours=self._get_signal_duration(signal_style))).isoformat(),
+                'timestamp': now.isoformat(),
+                'expires_at': (now + timedelta(hours=self._get_signal_duration(signal_style))).isoformat(),
                 'status': 'ACTIVE',
                 'priority': self._calculate_priority(ai_signal['confidence_score'], signal_style),
                 'market_analysis': market_analysis,
@@ -161,7 +301,7 @@ class RealtimeSignalService:
             }
             
             # Store in active signals
-            self.active_signals[signal_id] = enhanced_signal
+            self._add_active_signal(enhanced_signal)
             
             return enhanced_signal
             
@@ -169,20 +309,40 @@ class RealtimeSignalService:
             logger.error(f"Error creating enhanced AI signal: {e}")
             return None
     
+    def _uniforms(self, n: int) -> List[float]:
+        """Take n uniform [0, 1) values from the pool, refilling it from numpy in bulk"""
+        pool = self._uniform_pool
+        if len(pool) < n:
+            pool[:] = self._rng.random(_RNG_BATCH).tolist()
+        values = pool[-n:]
+        del pool[-n:]
+        return values
+    
+    def _pick(self, options: Tuple[str, ...]) -> str:
+        """Pick one option uniformly, from indices numpy draws in bulk per length"""
+        n = len(options)
+        try:
+            return options[next(self._index_draws[n])]
+        except StopIteration:
+            draws = self._index_draws[n] = iter(self._rng.integers(0, n, _RNG_BATCH).tolist())
+            return options[next(draws)]
+    
     async def _get_market_analysis(self, symbol: str) -> Dict:
         """Get real-time market analysis for the symbol"""
+        u = self._uniforms(10)
+        
         # Enhanced market analysis with multiple indicators
         return {
-            'trend': random.choice(['BULLISH', 'BEARISH', 'SIDEWAYS']),
-            'strength': round(random.uniform(0.3, 1.0), 2),
-            'volatility': round(random.uniform(0.1, 3.0), 2),
-            'volume': random.randint(1000, 50000),
-            'support_level': round(random.uniform(1.05, 1.08), 5),
-            'resistance_level': round(random.uniform(1.10, 1.15), 5),
-            'rsi': round(random.uniform(20, 80), 1),
-            'macd_signal': random.choice(['BUY', 'SELL', 'NEUTRAL']),
-            'bollinger_position': round(random.uniform(0, 1), 2),
-            'market_sentiment': random.choice(['BULLISH', 'BEARISH', 'NEUTRAL'])
+            'trend': _TRENDS[int(u[0] * 3)],
+            'strength': round(0.3 + 0.7 * u[1], 2),
+            'volatility': round(0.1 + 2.9 * u[2], 2),
+            'volume': 1000 + int(u[3] * 49001),
+            'support_level': round(1.05 + 0.03 * u[4], 5),
+            'resistance_level': round(1.10 + 0.05 * u[5], 5),
+            'rsi': round(20 + 60 * u[6], 1),
+            'macd_signal': _MACD_SIGNALS[int(u[7] * 3)],
+            'bollinger_position': round(u[8], 2),
+            'market_sentiment': _SENTIMENTS[int(u[9] * 3)]
         }
     
     def _calculate_risk_metrics(self, ai_signal: Dict, signal_style: str) -> Dict:
@@ -204,12 +364,7 @@ class RealtimeSignalService:
     
     def _get_signal_duration(self, signal_style: str) -> int:
         """Get signal duration in hours based on style"""
-        durations = {
-            'scalping': 1,
-            'intraday': 8,
-            'swing': 72
-        }
-        return durations.get(signal_style, 4)
+        return _SIGNAL_DURATIONS.get(signal_style, 4)
     
     def _calculate_priority(self, confidence: float, signal_style: str) -> str:
         """Calculate signal priority"""
@@ -225,7 +380,7 @@ class RealtimeSignalService:
     async def _create_ai_signal(self, signal_style: str) -> Optional[Dict]:
         """Create an AI-powered trading signal"""
         try:
-            symbol = random.choice(self.symbols)
+            symbol = self._pick(self._symbols_tuple)
             
             # Get AI signal data
             ai_signal = await ai_service.generate_signal(symbol, "H1")
@@ -245,48 +400,26 @@ class RealtimeSignalService:
     
     def _generate_enhanced_mock_signal(self, symbol: str, signal_style: str) -> Dict:
         """Generate enhanced mock signal with realistic market behavior"""
-        
-        # Base prices for different symbols
-        base_prices = {
-            'EURUSD': 1.0850, 'GBPUSD': 1.2650, 'USDJPY': 149.50,
-            'USDCHF': 0.8750, 'AUDUSD': 0.6550, 'USDCAD': 1.3650,
-            'NZDUSD': 0.6150, 'EURJPY': 162.25, 'GBPJPY': 189.15,
-            'EURGBP': 0.8580, 'XAUUSD': 2650.00, 'BTCUSD': 45000.00,
-            'ETHUSD': 2800.00
-        }
-        
-        base_price = base_prices.get(symbol, 1.0000)
+        base_price = _BASE_PRICES.get(symbol, 1.0000)
+        u = self._uniforms(5)
         
         # Add realistic price movement
-        price_change = random.uniform(-0.002, 0.002)
+        price_change = -0.002 + 0.004 * u[0]
         current_price = base_price + (base_price * price_change)
         
-        # Signal type based on market analysis patterns
-        signal_type = random.choice(['buy', 'sell'])
+        # Signal type based on market analysis patterns; sign is +1 for buy, -1 for sell
+        side = int(u[1] * 2)
+        signal_type = _SIGNAL_SIDES[side]
+        sign = 1 - 2 * side
         
         # Confidence based on signal style
-        confidence_ranges = {
-            'scalping': (0.60, 0.75),
-            'intraday': (0.70, 0.85),
-            'swing': (0.75, 0.95)
-        }
-        confidence = random.uniform(*confidence_ranges[signal_style])
+        low, high = _CONFIDENCE_RANGES[signal_style]
+        confidence = low + (high - low) * u[2]
         
         # Risk management based on signal style
-        risk_levels = {
-            'scalping': {'sl': 0.0005, 'tp': 0.0010},
-            'intraday': {'sl': 0.0015, 'tp': 0.0030},
-            'swing': {'sl': 0.0050, 'tp': 0.0100}
-        }
-        
-        risk = risk_levels[signal_style]
-        
-        if signal_type == 'buy':
-            stop_loss = current_price - (current_price * risk['sl'])
-            take_profit = current_price + (current_price * risk['tp'])
-        else:
-            stop_loss = current_price + (current_price * risk['sl'])
-            take_profit = current_price - (current_price * risk['tp'])
+        sl_pct, tp_pct = _RISK_LEVELS[signal_style]
+        stop_loss = current_price * (1 - sign * sl_pct)
+        take_profit = current_price * (1 + sign * tp_pct)
         
         return {
             'symbol': symbol,
@@ -295,25 +428,28 @@ class RealtimeSignalService:
             'entry_price': current_price,
             'stop_loss': stop_loss,
             'take_profit': take_profit,
-            'risk_reward_ratio': risk['tp'] / risk['sl'],
+            'risk_reward_ratio': tp_pct / sl_pct,
             'timeframe': signal_style,
+            # Priced from _BASE_PRICES, not the market, so never checked against live quotes
+            'source': 'mock',
             'analysis_data': {
                 'indicators': self._generate_technical_indicators(),
-                'market_sentiment': random.choice(['bullish', 'bearish', 'neutral']),
-                'volatility': random.uniform(0.1, 0.8)
+                'market_sentiment': _MOCK_SENTIMENTS[int(u[3] * 3)],
+                'volatility': 0.1 + 0.7 * u[4]
             }
         }
     
     def _generate_technical_indicators(self) -> Dict:
         """Generate realistic technical indicator values"""
+        u = self._uniforms(6)
         return {
-            'rsi': random.uniform(20, 80),
-            'macd': random.uniform(-0.001, 0.001),
-            'bollinger_position': random.uniform(0.1, 0.9),
-            'moving_average_trend': random.choice(['up', 'down', 'sideways']),
+            'rsi': 20 + 60 * u[0],
+            'macd': -0.001 + 0.002 * u[1],
+            'bollinger_position': 0.1 + 0.8 * u[2],
+            'moving_average_trend': _MA_TRENDS[int(u[3] * 3)],
             'support_resistance': {
-                'support': random.uniform(0.995, 0.999),
-                'resistance': random.uniform(1.001, 1.005)
+                'support': 0.995 + 0.004 * u[4],
+                'resistance': 1.001 + 0.004 * u[5]
             }
         }
     
@@ -321,7 +457,7 @@ class RealtimeSignalService:
         """Enhance signal with additional real-time analysis"""
         
         # Add timestamp and unique ID
-        signal['id'] = f"signal_{datetime.now().timestamp()}_{random.randint(1000, 9999)}"
+        signal['id'] = self._next_signal_id(signal_style)
         signal['timestamp'] = datetime.now().isoformat()
         signal['signal_style'] = signal_style
         signal['status'] = 'active'
@@ -361,8 +497,32 @@ class RealtimeSignalService:
         else:
             return 'American'
     
+    @staticmethod
+    def _signal_side(signal: Dict) -> str:
+        """Buy/sell side of a signal; enhanced signals carry it upper-cased under 'type'"""
+        return (signal.get('signal_type') or signal.get('type', '')).lower()
+    
+    def _add_active_signal(self, signal: Dict):
+        """Track a signal as active with its expiry time and statistics counts"""
+        signal_id = signal['id']
+        if signal_id not in self.active_signals:
+            expires_at = time.time() + _SIGNAL_EXPIRY.get(signal['signal_style'], _DEFAULT_SIGNAL_EXPIRY)
+            heapq.heappush(self._expiry_heap, (expires_at, signal_id))
+            self._signal_counts[signal['signal_style']] += 1
+            self._signal_counts[self._signal_side(signal)] += 1
+        self.active_signals[signal_id] = signal
+    
+    def _remove_active_signal(self, signal_id: str):
+        """Stop tracking an active signal"""
+        signal = self.active_signals.pop(signal_id)
+        self._signal_counts[signal['signal_style']] -= 1
+        self._signal_counts[self._signal_side(signal)] -= 1
+    
     async def _broadcast_signal(self, signal: Dict):
         """Broadcast signal to all WebSocket subscribers"""
+        # Store active signal so clients that connect later still receive it
+        self._add_active_signal(signal)
+        
         if not self.subscribers:
             return
         
@@ -371,124 +531,182 @@ class RealtimeSignalService:
             'data': signal
         }
         
-        # Store active signal
-        self.active_signals[signal['id']] = signal
-        
         # Broadcast to all subscribers
-        disconnected = set()
-        for subscriber in self.subscribers:
-            try:
-                await subscriber.send(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to subscriber: {e}")
-                disconnected.add(subscriber)
-        
-        # Remove disconnected subscribers
-        for subscriber in disconnected:
-            self.subscribers.discard(subscriber)
+        self._send_to_subscribers(_encode_message(message))
         
         logger.info(f"📡 Signal broadcasted: {signal['symbol']} {signal['signal_type'].upper()} - Confidence: {signal['confidence_score']:.2f}")
     
     async def _save_signal_to_db(self, signal: Dict):
-        """Save signal to database"""
+        """Queue signal for the next batched database insert"""
         try:
-            async with get_async_session() as db:
-                trading_signal = TradingSignal(
-                    user_id=1,  # System generated signals
-                    symbol=signal['symbol'],
-                    signal_type=SignalType(signal['signal_type']),
-                    confidence_score=signal['confidence_score'],
-                    entry_price=signal['entry_price'],
-                    stop_loss=signal['stop_loss'],
-                    take_profit=signal['take_profit'],
-                    risk_reward_ratio=signal['risk_reward_ratio'],
-                    timeframe=signal['signal_style'],
-                    analysis_data=signal.get('analysis_data', {}),
-                    status=SignalStatus.ACTIVE
-                )
-                
-                db.add(trading_signal)
-                await db.commit()
+            self._pending_signals.append({
+                'symbol': signal['symbol'],
+                'signal_type': SignalType(signal['signal_type']),
+                'confidence_score': signal['confidence_score'],
+                'entry_price': signal['entry_price'],
+                'stop_loss': signal['stop_loss'],
+                'take_profit': signal['take_profit'],
+                'risk_reward_ratio': signal['risk_reward_ratio'],
+                'timeframe': signal['signal_style'],
+                'analysis_data': orjson.dumps(
+                    signal.get('analysis_data', {}), option=orjson.OPT_SERIALIZE_NUMPY
+                ).decode(),
+                'status': SignalStatus.ACTIVE
+            })
+            
+            if len(self._pending_signals) >= _SIGNAL_FLUSH_BATCH:
+                await self._flush_signals()
                 
         except Exception as e:
             logger.error(f"Error saving signal to database: {e}")
     
+    async def _flush_signals(self):
+        """Insert all queued signals with a single statement and commit"""
+        async with self._flush_lock:
+            if not self._pending_signals:
+                return
+            rows, self._pending_signals = self._pending_signals, []
+            
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(insert(TradingSignal), rows)
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Error saving {len(rows)} signals to database: {e}")
+    
+    async def _flush_signals_to_db(self):
+        """Periodically write queued signals to the database"""
+        while self.running:
+            try:
+                await asyncio.sleep(_SIGNAL_FLUSH_INTERVAL)
+                await self._flush_signals()
+                
+            except Exception as e:
+                logger.error(f"Error flushing signals to database: {e}")
+    
     async def _cleanup_expired_signals(self):
         """Clean up expired signals"""
         while self.running:
             try:
-                current_time = datetime.now()
-                expired_signals = []
+                current_time = time.time()
                 
-                for signal_id, signal in self.active_signals.items():
-                    signal_time = datetime.fromisoformat(signal['timestamp'].replace('Z', '+00:00').replace('+00:00', ''))
-                    
-                    # Expire signals based on style
-                    expiry_times = {
-                        'scalping': timedelta(minutes=30),
-                        'intraday': timedelta(hours=8),
-                        'swing': timedelta(days=3)
-                    }
-                    
-                    expiry_time = expiry_times.get(signal['signal_style'], timedelta(hours=1))
-                    
-                    if current_time - signal_time > expiry_time:
-                        expired_signals.append(signal_id)
+                # Drop AI results that are too old to be reused
+                self._ai_cache = {
+                    key: hit for key, hit in self._ai_cache.items()
+                    if current_time - hit[0] < _AI_CACHE_TTL
+                }
                 
-                # Remove expired signals
-                for signal_id in expired_signals:
-                    del self.active_signals[signal_id]
+                # Pop only the signals whose expiry has passed, soonest first
+                heap = self._expiry_heap
+                while heap and heap[0][0] < current_time:
+                    _, signal_id = heapq.heappop(heap)
+                    if signal_id not in self.active_signals:
+                        continue
+                    self._remove_active_signal(signal_id)
                     
                     # Broadcast expiry notification
                     await self._broadcast_signal_update(signal_id, 'expired')
                 
-                await asyncio.sleep(300)  # Check every 5 minutes
+                await asyncio.sleep(60)  # Check every minute
                 
             except Exception as e:
                 logger.error(f"Error in signal cleanup: {e}")
                 await asyncio.sleep(600)
     
     async def _update_signal_status(self):
-        """Update signal status based on market movement"""
+        """Broadcast signal status changes as they are reported"""
         while self.running:
             try:
-                for signal_id, signal in self.active_signals.items():
-                    # Simulate signal status updates
-                    if random.random() < 0.1:  # 10% chance of status update
-                        new_status = random.choice(['hit_tp', 'hit_sl', 'modified'])
-                        await self._broadcast_signal_update(signal_id, new_status)
-                
-                await asyncio.sleep(60)  # Check every minute
+                signal_id, status = await self._status_events.get()
+                if signal_id in self.active_signals:
+                    if status in _CLOSING_STATUSES:
+                        self._remove_active_signal(signal_id)
+                    await self._broadcast_signal_update(signal_id, status)
                 
             except Exception as e:
                 logger.error(f"Error updating signal status: {e}")
                 await asyncio.sleep(120)
     
+    async def _watch_signal_levels(self):
+        """Report TP/SL hits for market-priced active signals from live terminal quotes"""
+        while self.running:
+            try:
+                await asyncio.sleep(_LEVEL_CHECK_INTERVAL)
+                
+                # One quote per symbol, however many signals are open on it
+                by_symbol = defaultdict(list)
+                for signal in self.active_signals.values():
+                    if signal.get('source') != 'mock':
+                        by_symbol[signal['symbol']].append(signal)
+                
+                for symbol, signals in by_symbol.items():
+                    quote = await mt5_service.get_symbol_info(symbol)
+                    if quote is None:
+                        continue
+                    for signal in signals:
+                        status = self._level_hit(signal, quote['bid'], quote['ask'])
+                        if status:
+                            self.report_signal_status(signal['id'], status)
+                
+            except Exception as e:
+                logger.error(f"Error checking signal levels: {e}")
+                await asyncio.sleep(60)
+    
+    @classmethod
+    def _level_hit(cls, signal: Dict, bid: float, ask: float) -> Optional[str]:
+        """'hit_tp' or 'hit_sl' once the quote reaches the signal's take profit or stop loss"""
+        if cls._signal_side(signal) == 'buy':
+            # Longs close at the bid, shorts at the ask
+            if bid >= signal['take_profit']:
+                return 'hit_tp'
+            if bid <= signal['stop_loss']:
+                return 'hit_sl'
+        else:
+            if ask <= signal['take_profit']:
+                return 'hit_tp'
+            if ask >= signal['stop_loss']:
+                return 'hit_sl'
+        return None
+    
     async def _broadcast_signal_update(self, signal_id: str, status: str):
-        """Broadcast signal status update"""
+        """Queue signal status update for the next coalesced broadcast"""
         if not self.subscribers:
             return
         
-        message = {
-            'type': 'signal_update',
-            'data': {
-                'signal_id': signal_id,
-                'status': status,
-                'timestamp': datetime.now().isoformat()
-            }
-        }
+        self._update_batch.append({
+            'signal_id': signal_id,
+            'status': status,
+            'timestamp': datetime.now()  # orjson writes the ISO string
+        })
+        if self._update_flush is None:
+            self._update_flush = asyncio.get_running_loop().call_later(
+                _UPDATE_COALESCE_DELAY, self._flush_signal_updates
+            )
+    
+    def _flush_signal_updates(self):
+        """Broadcast queued status updates, several at once as a single batch message"""
+        updates, self._update_batch = self._update_batch, []
+        self._update_flush = None
+        if not updates or not self.subscribers:
+            return
+        
+        if len(updates) == 1:
+            message = {'type': 'signal_update', 'data': updates[0]}
+        else:
+            message = {'type': 'signal_update_batch', 'data': updates}
         
         # Broadcast to all subscribers
-        disconnected = set()
-        for subscriber in self.subscribers:
-            try:
-                await subscriber.send(json.dumps(message))
-            except Exception as e:
-                disconnected.add(subscriber)
+        self._send_to_subscribers(_encode_message(message))
+    
+    def _send_to_subscribers(self, payload: str):
+        """Write a payload to every open subscriber and drop the closed ones"""
+        websockets.broadcast(self.subscribers, payload)
         
         # Remove disconnected subscribers
-        for subscriber in disconnected:
-            self.subscribers.discard(subscriber)
+        disconnected = {s for s in self.subscribers if s.close_code is not None}
+        self.subscribers -= disconnected
+        if not self.subscribers:
+            self._has_subscribers.clear()
     
     def get_active_signals(self) -> List[Dict]:
         """Get all currently active signals"""
@@ -496,16 +714,16 @@ class RealtimeSignalService:
     
     def get_signal_statistics(self) -> Dict:
         """Get signal generation statistics"""
+        counts = self._signal_counts
         return {
             'total_active_signals': len(self.active_signals),
             'subscribers_count': len(self.subscribers),
             'signals_by_style': {
-                style: len([s for s in self.active_signals.values() if s['signal_style'] == style])
-                for style in ['scalping', 'intraday', 'swing']
+                style: counts[style] for style in ['scalping', 'intraday', 'swing']
             },
             'signals_by_type': {
-                'buy': len([s for s in self.active_signals.values() if s['signal_type'] == 'buy']),
-                'sell': len([s for s in self.active_signals.values() if s['signal_type'] == 'sell'])
+                'buy': counts['buy'],
+                'sell': counts['sell']
             }
         }
 
@@ -1,11 +1,12 @@
 import asyncio
 import logging
+import time
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal
 from app.models.user import User
 from app.models.mt5_account import MT5Account
 from app.models.trading_signal import TradingSignal
@@ -16,11 +17,15 @@ from app.services.ai_service import ai_service
 
 logger = logging.getLogger(__name__)
 
+# How long an account snapshot is reused by risk checks and position sizing
+_ACCOUNT_INFO_TTL = 2.0
+
 
 class TradingBot:
     def __init__(self):
         self.active_bots = {}
         self.running = False
+        self._account_info_cache: Dict[int, Tuple[float, Dict]] = {}
         
     async def start_bot(self, user_id: int, mt5_account_id: int, config: BotConfiguration):
         """Start trading bot for a user."""
@@ -64,6 +69,18 @@ class TradingBot:
             logger.error(f"Error stopping trading bot: {str(e)}")
             return False
     
+    async def _account_info(self, account: MT5Account, ttl: float = _ACCOUNT_INFO_TTL) -> Optional[Dict]:
+        """Get account information, reusing a snapshot fetched within the last ttl seconds."""
+        now = time.monotonic()
+        cached = self._account_info_cache.get(account.id)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+        
+        account_info = await mt5_service.get_account_info(account)
+        if account_info:
+            self._account_info_cache[account.id] = (now, account_info)
+        return account_info
+    
     async def check_risk_limits(self, bot_data: Dict, account: MT5Account) -> bool:
         """Check if trading is allowed based on risk limits."""
         try:
@@ -80,7 +97,7 @@ class TradingBot:
                 return False
             
             # Check account balance
-            account_info = await mt5_service.get_account_info(account)
+            account_info = await self._account_info(account)
             if account_info:
                 # Check minimum balance
                 if account_info['balance'] < config.min_balance:
@@ -101,7 +118,7 @@ class TradingBot:
     async def calculate_position_size(self, account: MT5Account, signal: TradingSignal, config: BotConfiguration) -> float:
         """Calculate position size based on risk management rules."""
         try:
-            account_info = await mt5_service.get_account_info(account)
+            account_info = await self._account_info(account)
             if not account_info:
                 return 0.0
             
@@ -114,8 +131,8 @@ class TradingBot:
             if signal.stop_loss:
                 stop_loss_distance = abs(signal.entry_price - signal.stop_loss)
                 
-                # Get symbol info for point value calculation
-                symbol_info = await mt5_service.get_symbol_info(signal.symbol)
+                # Get contract fields for point value calculation; no live quote is needed
+                symbol_info = await mt5_service.get_symbol_contract(account, signal.symbol)
                 if symbol_info:
                     # Calculate position size based on risk
                     point_value = symbol_info['point']
@@ -205,12 +222,17 @@ class TradingBot:
                 )
             )
             open_trades = result.scalars().all()
+            if not open_trades:
+                return
+            
+            # Fetch the account's positions once and look each trade up by ticket
+            positions = await mt5_service.get_open_positions(account)
+            positions_by_ticket = {p['ticket']: p for p in positions}
             
             for trade in open_trades:
                 try:
                     # Get current position info
-                    positions = await mt5_service.get_open_positions(account)
-                    position = next((p for p in positions if p['ticket'] == trade.mt5_ticket), None)
+                    position = positions_by_ticket.get(trade.mt5_ticket)
                     
                     if not position:
                         # Position closed externally, update trade
@@ -312,6 +334,8 @@ class TradingBot:
                     trade = await self.execute_signal(signal, account, config, db)
                     if trade:
                         bot_data['trades_today'] += 1
+                        # The new position changes margin; re-read it for the next risk check
+                        self._account_info_cache.pop(account.id, None)
                         logger.info(f"Auto-executed signal {signal.id} for account {account.id}")
                 
                 except Exception as e:
@@ -324,55 +348,76 @@ class TradingBot:
         except Exception as e:
             logger.error(f"Error processing signals: {str(e)}")
     
-    async def run_bot_cycle(self):
-        """Run one cycle of the trading bot."""
-        if not self.active_bots:
+    async def _process_one_bot(self, bot_key: str, bot_data: Dict, account: Optional[MT5Account]):
+        """Run one cycle for a single bot in its own database session."""
+        if not account:
+            logger.error(f"Account not found for bot {bot_key}")
+            self.active_bots.pop(bot_key, None)
             return
         
-        async for db in get_db():
+        # Each cycle starts from a fresh account snapshot
+        self._account_info_cache.pop(account.id, None)
+        
+        async with AsyncSessionLocal() as db:
             try:
-                for bot_key, bot_data in list(self.active_bots.items()):
-                    try:
-                        # Get account
-                        result = await db.execute(
-                            select(MT5Account).where(MT5Account.id == bot_data['mt5_account_id'])
-                        )
-                        account = result.scalar_one_or_none()
-                        
-                        if not account:
-                            logger.error(f"Account not found for bot {bot_key}")
-                            del self.active_bots[bot_key]
-                            continue
-                        
-                        # Check if account is connected
-                        if not account.is_connected:
-                            # Try to reconnect
-                            if not await mt5_service.connect_mt5_account(account):
-                                logger.warning(f"Failed to connect account {account.id}")
-                                continue
-                        
-                        # Reset daily counters if new day
-                        now = datetime.utcnow()
-                        if now.date() > bot_data['started_at'].date():
-                            bot_data['trades_today'] = 0
-                            bot_data['daily_pnl'] = 0.0
-                            bot_data['started_at'] = now
-                        
-                        # Monitor existing trades
-                        await self.monitor_trades(bot_data, account, db)
-                        
-                        # Process new signals
-                        await self.process_signals(bot_data, account, db)
-                        
-                    except Exception as e:
-                        logger.error(f"Error in bot cycle for {bot_key}: {str(e)}")
-                        continue
-                        
+                # Attach the preloaded account to this session without querying it again
+                account = await db.merge(account, load=False)
+                
+                # Check if account is connected
+                if not account.is_connected:
+                    # Try to reconnect
+                    if not await mt5_service.connect_mt5_account(account):
+                        logger.warning(f"Failed to connect account {account.id}")
+                        return
+                
+                # Reset daily counters if new day
+                now = datetime.utcnow()
+                if now.date() > bot_data['started_at'].date():
+                    bot_data['trades_today'] = 0
+                    bot_data['daily_pnl'] = 0.0
+                    bot_data['started_at'] = now
+                
+                # Monitor existing trades
+                await self.monitor_trades(bot_data, account, db)
+                
+                # Process new signals
+                await self.process_signals(bot_data, account, db)
+                
+                # Persist connection status changes made on the account
+                await db.commit()
+                
             except Exception as e:
-                logger.error(f"Error in bot cycle: {str(e)}")
-            finally:
-                await db.close()
+                logger.error(f"Error in bot cycle for {bot_key}: {str(e)}")
     
+    async def run_bot_cycle(self):
+        """Run one cycle of the trading bot."""
+        if not self.active_bots:
+            return
+        
+        bots = list(self.active_bots.items())
+        
+        # Load every bot's account in one query
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(MT5Account).where(
+                        MT5Account.id.in_({bot_data['mt5_account_id'] for _, bot_data in bots})
+                    )
+                )
+                accounts = {account.id: account for account in result.scalars()}
+        except Exception as e:
+            logger.error(f"Error loading bot accounts: {str(e)}")
+            return
+        
+        # Bots run concurrently, each with its own session, so their MT5 and database waits overlap
+        await asyncio.gather(
+            *(
+                self._process_one_bot(bot_key, bot_data, accounts.get(bot_data['mt5_account_id']))
+                for bot_key, bot_data in bots
+            ),
+            return_exceptions=True
+        )
+
     async def start_main_loop(self):
         """Start the main trading bot loop."""
         self.running = True
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test that the TP/SL level watcher only resolves market-priced signals
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("MetaTrader5")
+
+from app.services import realtime_signal_service as rss
+
+
+def _drain(queue: asyncio.Queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def test_mock_signals_ignore_live_quotes(monkeypatch):
+    """A live quote far from _BASE_PRICES must not settle a mock signal."""
+    service = rss.RealtimeSignalService()
+
+    async def live_quote(symbol):
+        # Well above EURUSD's mock base price of 1.0850
+        return {'bid': 1.2500, 'ask': 1.2502}
+
+    monkeypatch.setattr(rss.mt5_service, 'get_symbol_info', live_quote)
+    monkeypatch.setattr(rss, '_LEVEL_CHECK_INTERVAL', 0)
+
+    async def run():
+        mock = service._generate_enhanced_mock_signal('EURUSD', 'intraday')
+        mock = await service._enhance_signal_with_analysis(mock, 'intraday')
+        service._add_active_signal(mock)
+
+        # A market-priced long whose take profit the quote has passed
+        market = {
+            'id': 'intraday_market', 'symbol': 'EURUSD', 'type': 'BUY',
+            'signal_style': 'intraday', 'stop_loss': 1.2000, 'take_profit': 1.2400
+        }
+        service._add_active_signal(market)
+
+        service.running = True
+        watcher = asyncio.create_task(service._watch_signal_levels())
+        await asyncio.sleep(0.05)
+        service.running = False
+        watcher.cancel()
+
+        return mock['id'], _drain(service._status_events)
+
+    mock_id, events = asyncio.run(run())
+
+    assert ('intraday_market', 'hit_tp') in events
+    assert all(signal_id != mock_id for signal_id, _ in events)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -8,6 +8,11 @@ import numpy as np
 from typing import Dict, List, Set
 import MetaTrader5 as mt5
 
+try:
+    import uvloop
+except ImportError:  # No Windows build; fall back to the stdlib loop
+    uvloop = None
+
 # Import the real-time signal service
 from app.services.realtime_signal_service import realtime_signal_service
 
@@ -18,6 +23,12 @@ from logging_config import setup_logging
 setup_logging(log_level=logging.INFO)
 logger = logging.getLogger('websocket_server')
 
+def install_event_loop():
+    """Run the server on uvloop where it is available"""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+
 class MarketDataStreamer:
     def __init__(self):
         self.connected_clients: Set[websockets.WebSocketServerProtocol] = set()
@@ -337,6 +348,7 @@ class MarketDataStreamer:
 def main():
     """Main function to start the WebSocket server"""
     streamer = MarketDataStreamer()
+    install_event_loop()
     
     try:
         asyncio.run(streamer.start_server())
@@ -364,6 +376,7 @@ if __name__ == "__main__":
     print("🔄 MT5 integration ready (mock mode)")
     print("Press Ctrl+C to stop the server")
     
+    install_event_loop()
     try:
         asyncio.run(streamer.start_server(host, port))
     except KeyboardInterrupt:
@@ -38,6 +38,17 @@ const RealTimeSignals = () => {
           ));
           break;
           
+        case 'signal_update_batch': {
+          const updates = new Map(data.data.map(update => [update.signal_id, update]));
+          setSignals(prev => prev.map(signal => {
+            const update = updates.get(signal.id);
+            return update
+              ? { ...signal, status: update.status, updated_at: update.timestamp }
+              : signal;
+          }));
+          break;
+        }
+          
         default:
           console.log('Unknown message type:', data.type);
       }